@@ -2,10 +2,24 @@
 
 import os
 import re
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from dotenv import load_dotenv, set_key, find_dotenv
 
+try:
+    import fcntl
+except ImportError:  # Windows; updates are then only serialized within this process
+    fcntl = None
+
+
+# sk- or sk-proj- followed by alphanumeric characters
+_OPENAI_KEY_RE = re.compile(r'^sk-(?:proj-)?[a-zA-Z0-9]{32,}$')
+# AIza followed by 35 alphanumeric, dash or underscore characters (39 in total)
+_GEMINI_KEY_RE = re.compile(r'AIza[a-zA-Z0-9_-]{35}')
+
 
 class APIKeyValidationError(Exception):
     """Raised when an API key fails validation."""
@@ -21,9 +35,7 @@ def validate_openai_key(key: Optional[str]) -> bool:
     if not key or not isinstance(key, str):
         return False
     
-    # Check format: sk- or sk-proj- followed by alphanumeric characters
-    pattern = r'^sk-(?:proj-)?[a-zA-Z0-9]{32,}$'
-    return bool(re.match(pattern, key))
+    return _OPENAI_KEY_RE.match(key) is not None
 
 
 def validate_gemini_key(key: Optional[str]) -> bool:
@@ -34,16 +46,8 @@ def validate_gemini_key(key: Optional[str]) -> bool:
     if not key or not isinstance(key, str):
         return False
     
-    # Check format: AIza followed by any characters totaling 39 chars
     # Google API keys can have various characters including hyphens after the prefix
-    if len(key) != 39 or not key.startswith('AIza'):
-        return False
-    
-    # Check that remaining characters are alphanumeric, dash, or underscore
-    # Note: We already checked length and prefix, so just verify allowed chars
-    allowed_chars = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-')
-    remaining = key[4:]  # Skip 'AIza'
-    return all(c in allowed_chars for c in remaining)
+    return _GEMINI_KEY_RE.fullmatch(key) is not None
 
 
 def mask_api_key(key: Optional[str]) -> str:
@@ -86,6 +90,12 @@ class APIKeyManager:
             self.env_file_path.touch()
             self.env_file_path.write_text("# API Keys\n")
         
+        # Parsed lines of the .env file, keyed on the (mtime_ns, size) they were read at
+        self._env_lines_cache: Optional[Tuple[int, int, List[str]]] = None
+        self._env_lock = threading.Lock()
+        # The .env file itself is replaced on every write, so processes lock a sibling file
+        self._lock_file_path = self.env_file_path.with_name(self.env_file_path.name + '.lock')
+        
         # Load environment variables
         load_dotenv(self.env_file_path)
     
@@ -189,15 +199,64 @@ class APIKeyManager:
             key: Environment variable name
             value: Value to set (can be empty)
         """
-        # Ensure file exists
-        if not self.env_file_path.exists():
-            self.env_file_path.touch()
-            self.env_file_path.write_text("# API Keys\n")
+        with self._env_file_locked():
+            # Ensure file exists
+            if not self.env_file_path.exists():
+                self.env_file_path.touch()
+                self.env_file_path.write_text("# API Keys\n")
+            
+            new_lines = self._replace_env_line(self._read_env_lines(), key, value)
+            self._write_env_lines(new_lines)
+    
+    @contextmanager
+    def _env_file_locked(self) -> Iterator[None]:
+        """Hold the .env file exclusively against other threads and processes."""
+        with self._env_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_file_path, 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                yield
+    
+    def _read_env_lines(self) -> List[str]:
+        """Read the .env file's lines, reusing the last parse if the file is unchanged."""
+        stat = self.env_file_path.stat()
+        cache = self._env_lines_cache
+        if cache is not None and cache[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cache[2]
+        
+        lines = self.env_file_path.read_text().splitlines()
+        self._env_lines_cache = (stat.st_mtime_ns, stat.st_size, lines)
+        return lines
+    
+    def _write_env_lines(self, lines: List[str]) -> None:
+        """Atomically replace the .env file and remember what was written."""
+        new_content = '\n'.join(lines)
+        if not new_content.endswith('\n'):
+            new_content += '\n'
         
-        # Read current content
-        content = self.env_file_path.read_text()
-        lines = content.splitlines()
+        # Write a sibling file and rename it over the original, so readers
+        # never see a half-written file; resolve first so a symlinked .env
+        # is updated rather than replaced
+        target = self.env_file_path.resolve()
+        mode = target.stat().st_mode
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix='.env.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(new_content)
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, target)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
         
+        stat = self.env_file_path.stat()
+        self._env_lines_cache = (stat.st_mtime_ns, stat.st_size, lines)
+    
+    @staticmethod
+    def _replace_env_line(lines: List[str], key: str, value: str) -> List[str]:
+        """Return the lines with key set to value, appending it if missing."""
         # Check if key exists
         key_found = False
         new_lines = []
@@ -219,12 +278,7 @@ class APIKeyManager:
         if not key_found:
             new_lines.append(f"{key}={value}")
         
-        # Write back to file
-        new_content = '\n'.join(new_lines)
-        if not new_content.endswith('\n'):
-            new_content += '\n'
-        
-        self.env_file_path.write_text(new_content)
+        return new_lines
     
     def reload_environment(self) -> None:
         """Reload environment variables from .env file.
@@ -49,6 +49,7 @@ class AudioCapture:
         self._is_initialized = False
         self._capture_task: Optional[asyncio.Task] = None
         self._audio_queue: asyncio.Queue[AudioChunk] = asyncio.Queue()
+        self.chunk_available = asyncio.Event()
         
         # Register backends on first use
         self._register_backends()
@@ -145,6 +146,7 @@ class AudioCapture:
             while True:
                 chunk = await self._backend.get_audio_chunk()
                 await self._audio_queue.put(chunk)
+                self.chunk_available.set()
         except asyncio.CancelledError:
             raise
         except Exception as e:
@@ -155,6 +157,14 @@ class AudioCapture:
         """Get the next audio chunk."""
         return await self._audio_queue.get()
     
+    def get_audio_chunk_nowait(self) -> Optional[AudioChunk]:
+        """Get the next audio chunk, or None if none is queued."""
+        try:
+            return self._audio_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            self.chunk_available.clear()
+            return None
+    
     async def stream_audio(self) -> AsyncIterator[AudioChunk]:
         """Stream audio chunks as they become available."""
         while True:
@@ -9,6 +9,53 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Deque
 import numpy as np
 
+try:
+    import numpy_rms
+except ImportError:  # Optional, installed with the `speedups` extra
+    numpy_rms = None
+
+try:
+    from numba import njit
+except ImportError:  # Optional, installed with the `speedups` extra
+    njit = None
+
+
+def _sum_of_squares_numpy(audio_chunk: np.ndarray) -> float:
+    """Sum of squared samples via one float32 copy and a BLAS dot."""
+    # int16 values are exact in float32 and the sum's rounding is far below the threshold
+    samples = audio_chunk.astype(np.float32)
+    return float(np.dot(samples, samples))
+
+
+def _copy_and_sum_squares_numpy(audio_chunk: np.ndarray, buffer: np.ndarray, start: int) -> float:
+    """Copy a chunk into the buffer at start and return its sum of squares."""
+    buffer[start:start + len(audio_chunk)] = audio_chunk
+    return _sum_of_squares_numpy(audio_chunk)
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _sum_of_squares(audio_chunk):
+        """Sum of squared samples in one pass, with no float copy of the chunk."""
+        total = 0
+        for i in range(audio_chunk.shape[0]):
+            sample = np.int64(audio_chunk[i])
+            total += sample * sample
+        return float(total)
+
+    @njit(cache=True, nogil=True)
+    def _copy_and_sum_squares(audio_chunk, buffer, start):
+        """Copy a chunk into the buffer and sum its squares in the same pass."""
+        total = 0
+        for i in range(audio_chunk.shape[0]):
+            sample = np.int64(audio_chunk[i])
+            buffer[start + i] = sample
+            total += sample * sample
+        return float(total)
+else:
+    _sum_of_squares = _sum_of_squares_numpy
+    _copy_and_sum_squares = _copy_and_sum_squares_numpy
+
 
 @dataclass
 class AudioBatch:
@@ -19,12 +66,21 @@ class AudioBatch:
     duration: float = 0.0
     sequence_id: int = 0
     is_final: bool = False
+    sample_rate: int = 16000
+    _wav_bytes: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Calculate duration if not provided."""
         if self.duration == 0.0 and len(self.audio_data) > 0:
-            # Assume 16kHz sample rate
-            self.duration = len(self.audio_data) / 16000.0
+            self.duration = len(self.audio_data) / self.sample_rate
+    
+    @property
+    def wav_bytes(self) -> bytes:
+        """Get the preprocessed WAV encoding, computed once and shared by all consumers."""
+        if self._wav_bytes is None:
+            from .whisper_integration import AudioProcessor  # Import here to avoid circular import
+            self._wav_bytes = AudioProcessor.preprocess_to_wav(self.audio_data, self.sample_rate)
+        return self._wav_bytes
     
     @property
     def size_bytes(self) -> int:
@@ -70,12 +126,11 @@ class SilenceDetector:
         self.silence_start_time = None
         self.last_speech_time = time.time()
     
-    def is_silence(self, audio_chunk: np.ndarray) -> bool:
-        """Detect if audio chunk contains silence."""
-        energy = self._calculate_rms_energy(audio_chunk)
+    def is_silence(self, audio_chunk: np.ndarray, sum_of_squares: Optional[float] = None) -> bool:
+        """Detect if audio chunk contains silence, reusing its sum of squares if known."""
         current_time = time.time()
         
-        if energy > self.energy_threshold:
+        if self._exceeds_energy_threshold(audio_chunk, sum_of_squares):
             # Speech detected
             self.last_speech_time = current_time
             self.silence_start_time = None
@@ -92,11 +147,24 @@ class SilenceDetector:
             return 0
         return int((time.time() - self.silence_start_time) * 1000)
     
+    def _exceeds_energy_threshold(self, audio_chunk: np.ndarray,
+                                  sum_of_squares: Optional[float] = None) -> bool:
+        """Check RMS energy against the threshold, comparing squares to skip the sqrt."""
+        if sum_of_squares is None:
+            if numpy_rms is not None or len(audio_chunk) == 0:
+                return self._calculate_rms_energy(audio_chunk) > self.energy_threshold
+            sum_of_squares = _sum_of_squares(audio_chunk)
+        return sum_of_squares > self.energy_threshold ** 2 * len(audio_chunk)
+    
     def _calculate_rms_energy(self, audio_chunk: np.ndarray) -> float:
         """Calculate RMS energy of audio chunk."""
         if len(audio_chunk) == 0:
             return 0.0
-        return float(np.sqrt(np.mean(audio_chunk.astype(np.float64) ** 2)))
+        if numpy_rms is not None:
+            # SIMD kernel fuses square and sum; one window spanning the chunk
+            samples = audio_chunk.astype(np.float32)
+            return float(numpy_rms.rms(samples, window_size=len(samples))[0])
+        return float(np.sqrt(_sum_of_squares(audio_chunk) / len(audio_chunk)))
 
 
 class BatchQueue:
@@ -104,14 +172,14 @@ class BatchQueue:
     
     def __init__(self, max_size: int = 100):
         self.max_size = max_size
-        self._queue: Deque[AudioBatch] = deque()
+        # Bounded ring: appending to a full deque drops the oldest batch in O(1)
+        self._queue: Deque[AudioBatch] = deque(maxlen=max_size)
         self._lock = asyncio.Lock()
     
     def put(self, batch: AudioBatch) -> None:
         """Add batch to queue (sync version)."""
-        if len(self._queue) >= self.max_size:
+        if len(self._queue) == self.max_size:
             warnings.warn("Batch queue overflow, dropping oldest batch", UserWarning)
-            self._queue.popleft()
         self._queue.append(batch)
     
     async def put_async(self, batch: AudioBatch) -> None:
@@ -145,13 +213,32 @@ class VADAudioBatcher:
     def __init__(self, config: BatchingConfig):
         self.config = config
         self.silence_detector = SilenceDetector(config)
-        self.current_batch: List[int] = []
+        # Preallocated sample buffer; only the first _write samples belong to the batch
+        self._buffer = np.empty(int(config.max_batch_duration * config.sample_rate), dtype=np.int16)
+        self._write = 0
         self.batch_start_time: Optional[datetime] = None
         self.sequence_id = 0
         self.is_processing = False
         self.previous_batch_audio: Optional[np.ndarray] = None
         self._lock = asyncio.Lock()
     
+    @property
+    def current_batch(self) -> np.ndarray:
+        """Samples collected for the batch in progress (a view, not a copy)."""
+        return self._buffer[:self._write]
+    
+    def _append_audio(self, audio_chunk: np.ndarray) -> float:
+        """Copy a chunk into the sample buffer and return its sum of squares."""
+        end = self._write + len(audio_chunk)
+        if end > len(self._buffer):
+            grown = np.empty(max(end, 2 * len(self._buffer)), dtype=np.int16)
+            grown[:self._write] = self._buffer[:self._write]
+            self._buffer = grown
+        # One pass over the chunk feeds both the batch and the silence detector
+        sum_of_squares = _copy_and_sum_squares(audio_chunk, self._buffer, self._write)
+        self._write = end
+        return sum_of_squares
+    
     async def add_audio_chunk(self, audio_chunk: np.ndarray) -> Optional[AudioBatch]:
         """Add audio chunk and return batch if ready."""
         async with self._lock:
@@ -163,13 +250,13 @@ class VADAudioBatcher:
             self.batch_start_time = datetime.now()
         
         # Add chunk to current batch
-        self.current_batch.extend(audio_chunk.tolist())
+        sum_of_squares = self._append_audio(audio_chunk)
         
         # Calculate current batch duration
-        current_duration = len(self.current_batch) / self.config.sample_rate
+        current_duration = self._write / self.config.sample_rate
         
         # Check for silence
-        is_silence = self.silence_detector.is_silence(audio_chunk)
+        is_silence = self.silence_detector.is_silence(audio_chunk, sum_of_squares)
         silence_duration = self.silence_detector.get_silence_duration()
         
         # Determine if we should create a batch
@@ -194,21 +281,25 @@ class VADAudioBatcher:
     
     def _create_batch(self) -> AudioBatch:
         """Create an AudioBatch from current data."""
-        audio_data = np.array(self.current_batch, dtype=np.int16)
+        audio_data = self._buffer[:self._write]
         
-        # Add overlap from previous batch if available
+        # Add overlap from previous batch if available; either way the batch owns its samples
         overlap = self._calculate_overlap()
         if overlap is not None and len(overlap) > 0:
             audio_data = np.concatenate([overlap, audio_data])
+        else:
+            audio_data = audio_data.copy()
         
         batch = AudioBatch(
             audio_data=audio_data,
             timestamp=self.batch_start_time or datetime.now(),
-            sequence_id=self.sequence_id
+            sequence_id=self.sequence_id,
+            sample_rate=self.config.sample_rate
         )
         
-        # Store audio for next batch overlap
-        self.previous_batch_audio = audio_data.copy()
+        # Store only the tail the next batch overlaps with, not a copy of the whole batch
+        overlap_samples = int(self.config.overlap_duration * self.config.sample_rate)
+        self.previous_batch_audio = audio_data[max(0, len(audio_data) - overlap_samples):].copy()
         self.sequence_id += 1
         
         return batch
@@ -226,13 +317,13 @@ class VADAudioBatcher:
     
     def _reset_batch(self) -> None:
         """Reset current batch state."""
-        self.current_batch = []
+        self._write = 0
         self.batch_start_time = None
     
     async def force_batch(self) -> Optional[AudioBatch]:
         """Force creation of batch from current data."""
         async with self._lock:
-            if len(self.current_batch) > 0:
+            if self._write > 0:
                 batch = self._create_batch()
                 self._reset_batch()
                 return batch
@@ -327,7 +418,8 @@ def merge_audio_batches(batches: List[AudioBatch]) -> AudioBatch:
         timestamp=timestamp,
         duration=total_duration,
         sequence_id=batches[0].sequence_id,
-        is_final=True
+        is_final=True,
+        sample_rate=batches[0].sample_rate
     )
 
 
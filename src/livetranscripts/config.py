@@ -93,6 +93,13 @@ class TranscriptionConfig:
     api_timeout: float = 30.0
     max_retries: int = 3
     retry_delay: float = 1.0
+    max_concurrent_requests: int = 4
+    max_concurrent_batches: int = 4  # Batches transcribed in parallel; results still delivered in order
+    history_max: int = 10000  # Transcription results kept in memory
+    result_cache_size: int = 256  # Results reused for byte-identical audio; 0 disables
+    silence_peak_threshold: int = 200  # Batches peaking below this (int16 scale) skip the API; 0 disables
+    requests_per_minute: Optional[float] = None  # Client-side rate limit per model; None disables
+    hedge_delay: Optional[float] = 15.0  # Start next fallback if no answer by then; None disables
     
     def __post_init__(self):
         """Validate configuration."""
@@ -112,6 +119,21 @@ class TranscriptionConfig:
             if model not in supported_models:
                 raise ValueError(f"Unsupported fallback model: {model}")
 
+        if self.max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
+        if self.max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be at least 1")
+        if self.history_max < 1:
+            raise ValueError("history_max must be at least 1")
+        if self.result_cache_size < 0:
+            raise ValueError("result_cache_size must be non-negative")
+        if self.silence_peak_threshold < 0:
+            raise ValueError("silence_peak_threshold must be non-negative")
+        if self.requests_per_minute is not None and self.requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        if self.hedge_delay is not None and self.hedge_delay < 0:
+            raise ValueError("hedge_delay must be non-negative")
+
 
 @dataclass
 class AIConfig:
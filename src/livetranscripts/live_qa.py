@@ -9,13 +9,46 @@ import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Set, Callable, Any
+from typing import Dict, List, Optional, Set, Callable, Any, Union
 import websockets
 from websockets.exceptions import ConnectionClosed, InvalidMessage
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional, installed with the `speedups` extra
+    orjson = None
+
+
+if orjson is not None:
+    # Numpy buffers and numeric dict keys are serialized natively, without a fallback
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert numpy arrays and scalars for the stdlib encoder."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a WebSocket message, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits, which the stdlib encoder still accepts
+    return json.dumps(obj, default=_json_default)
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a WebSocket message, using orjson when it is installed."""
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 class MessageType(Enum):
     """WebSocket message types."""
@@ -48,6 +81,7 @@ class MessageType(Enum):
     KB_RECORD_UPDATED = "kb_record_updated"
     KB_RECORD_DELETED = "kb_record_deleted"
     KB_RECORD_CONTENT = "kb_record_content"
+    BATCH = "batch"
 
 
 class ConnectionState(Enum):
@@ -226,6 +260,23 @@ class SessionManager:
 class WebSocketHandler:
     """Handles individual WebSocket connections."""
     
+    # Incoming message type -> name of the method that handles it
+    _HANDLERS = {
+        MessageType.QUESTION.value: "_handle_question",
+        MessageType.INTENT.value: "_handle_intent",
+        MessageType.RECORDING_CONTROL.value: "_handle_recording_control",
+        MessageType.STATUS_REQUEST.value: "_handle_status_request",
+        MessageType.UPDATE_KB.value: "_handle_kb_update",
+        MessageType.GET_API_KEYS.value: "_handle_get_api_keys",
+        MessageType.SET_API_KEYS.value: "_handle_set_api_keys",
+        MessageType.LIST_KB_RECORDS.value: "_handle_list_kb_records",
+        MessageType.CREATE_KB_RECORD.value: "_handle_create_kb_record",
+        MessageType.UPDATE_KB_RECORD.value: "_handle_update_kb_record",
+        MessageType.DELETE_KB_RECORD.value: "_handle_delete_kb_record",
+        MessageType.GET_KB_RECORD.value: "_handle_get_kb_record",
+    }
+    _MESSAGE_TYPES = frozenset(mt.value for mt in MessageType)
+    
     def __init__(self, session_manager: SessionManager, qa_handler, server=None):
         self.session_manager = session_manager
         self.qa_handler = qa_handler
@@ -243,14 +294,16 @@ class WebSocketHandler:
             self.current_session_id = self.session_manager.create_session(user_id)
             print(f"📝 Created session: {self.current_session_id}")
             
+            # Greeting messages are collected and sent together in one frame
+            greeting = []
+            
             # Send welcome message
             welcome_msg = {
                 "type": "status",
                 "message": "Connected to Live Q&A",
                 "session_id": self.current_session_id
             }
-            await websocket.send(json.dumps(welcome_msg))
-            print(f"👋 Sent welcome message to {self.current_session_id}")
+            greeting.append(welcome_msg)
             
             # Send current KB content if available
             if self.knowledge_base and hasattr(self.knowledge_base, 'get_content'):
@@ -259,20 +312,14 @@ class WebSocketHandler:
                     "type": MessageType.KB_CONTENT.value,
                     "content": kb_content
                 }
-                await websocket.send(json.dumps(kb_msg))
-                print(f"📚 Sent KB content to {self.current_session_id}")
+                greeting.append(kb_msg)
             
             # Send API keys status
             if self.server and hasattr(self.server, 'api_key_manager'):
-                keys = self.server.api_key_manager.get_api_keys(masked=True)
-                api_keys_status_msg = {
-                    "type": MessageType.API_KEYS_STATUS.value,
-                    "has_openai_key": bool(keys.get('openai_key', '')),
-                    "has_gemini_key": bool(keys.get('gemini_key', '')),
-                    "timestamp": datetime.now().isoformat()
-                }
-                await websocket.send(json.dumps(api_keys_status_msg))
-                print(f"🔑 Sent API keys status to {self.current_session_id}")
+                greeting.append(self._api_keys_status_message())
+            
+            await self._send_batch(websocket, greeting)
+            print(f"👋 Sent welcome message to {self.current_session_id}")
             
             # Handle messages
             print(f"👂 Listening for messages from {self.current_session_id}")
@@ -293,10 +340,22 @@ class WebSocketHandler:
                 self.session_manager.close_session(self.current_session_id)
                 print(f"🧹 Cleaned up session: {self.current_session_id}")
     
+    async def _send_batch(self, websocket, messages: List[Dict[str, Any]]) -> None:
+        """Send messages in one frame, using the batch envelope when there are several."""
+        if not messages:
+            return
+        if len(messages) == 1:
+            await websocket.send(_json_dumps(messages[0]))
+        else:
+            await websocket.send(_json_dumps({
+                "type": MessageType.BATCH.value,
+                "items": messages
+            }))
+    
     async def _process_message(self, websocket, message: str) -> None:
         """Process incoming WebSocket message."""
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             
             if not self._validate_message(data):
                 await self._send_error(websocket, "Invalid message format", None)
@@ -304,30 +363,9 @@ class WebSocketHandler:
             
             message_type = data.get("type")
             
-            if message_type == MessageType.QUESTION.value:
-                await self._handle_question(websocket, data)
-            elif message_type == MessageType.INTENT.value:
-                await self._handle_intent(websocket, data)
-            elif message_type == MessageType.RECORDING_CONTROL.value:
-                await self._handle_recording_control(websocket, data)
-            elif message_type == MessageType.STATUS_REQUEST.value:
-                await self._handle_status_request(websocket, data)
-            elif message_type == MessageType.UPDATE_KB.value:
-                await self._handle_kb_update(websocket, data)
-            elif message_type == MessageType.GET_API_KEYS.value:
-                await self._handle_get_api_keys(websocket, data)
-            elif message_type == MessageType.SET_API_KEYS.value:
-                await self._handle_set_api_keys(websocket, data)
-            elif message_type == MessageType.LIST_KB_RECORDS.value:
-                await self._handle_list_kb_records(websocket, data)
-            elif message_type == MessageType.CREATE_KB_RECORD.value:
-                await self._handle_create_kb_record(websocket, data)
-            elif message_type == MessageType.UPDATE_KB_RECORD.value:
-                await self._handle_update_kb_record(websocket, data)
-            elif message_type == MessageType.DELETE_KB_RECORD.value:
-                await self._handle_delete_kb_record(websocket, data)
-            elif message_type == MessageType.GET_KB_RECORD.value:
-                await self._handle_get_kb_record(websocket, data)
+            handler_name = self._HANDLERS.get(message_type)
+            if handler_name is not None:
+                await getattr(self, handler_name)(websocket, data)
             else:
                 await self._send_error(websocket, f"Unknown message type: {message_type}", data.get("request_id"))
                 
@@ -399,7 +437,7 @@ class WebSocketHandler:
             "content": response.answer,
             **response.to_dict()
         }
-        await websocket.send(json.dumps(message))
+        await websocket.send(_json_dumps(message))
     
     async def _handle_intent(self, websocket, data: Dict[str, Any]) -> None:
         """Handle intent update from client."""
@@ -422,7 +460,7 @@ class WebSocketHandler:
                 "message": f"Session focus updated: {self.current_intent if self.current_intent else 'Default'}",
                 "timestamp": datetime.now().isoformat()
             }
-            await websocket.send(json.dumps(confirmation))
+            await websocket.send(_json_dumps(confirmation))
             
         except Exception as e:
             await self._send_error(websocket, f"Failed to update intent: {e}", None)
@@ -452,7 +490,7 @@ class WebSocketHandler:
                 "message": "Knowledge base updated successfully",
                 "timestamp": datetime.now().isoformat()
             }
-            await websocket.send(json.dumps(confirmation))
+            await websocket.send(_json_dumps(confirmation))
             
         except Exception as e:
             await self._send_error(websocket, f"Failed to update KB: {e}", None)
@@ -477,7 +515,7 @@ class WebSocketHandler:
                     "message": f"Recording {'started' if action == 'start' else 'stopped'}",
                     "timestamp": datetime.now().isoformat()
                 }
-                await websocket.send(json.dumps(status_msg))
+                await websocket.send(_json_dumps(status_msg))
                 
                 # Broadcast recording status to all clients
                 recording_status = {
@@ -509,7 +547,7 @@ class WebSocketHandler:
                         "timestamp": datetime.now().isoformat()
                     }
                 }
-                await websocket.send(json.dumps(recording_status))
+                await websocket.send(_json_dumps(recording_status))
                 print(f"📤 Sent recording status: {self.server.recording_enabled if self.server else True}")
             
         except Exception as e:
@@ -529,7 +567,7 @@ class WebSocketHandler:
                     "gemini_key": keys.get('gemini_key', ''),
                     "timestamp": datetime.now().isoformat()
                 }
-                await websocket.send(json.dumps(response))
+                await websocket.send(_json_dumps(response))
                 print(f"🔑 Sent masked API keys to {self.current_session_id}")
             else:
                 await self._send_error(websocket, "API key manager not available", None)
@@ -554,16 +592,6 @@ class WebSocketHandler:
                     # Reload environment variables
                     self.server.api_key_manager.reload_environment()
                     
-                    # Send success response
-                    response = {
-                        "type": MessageType.API_KEYS_UPDATED.value,
-                        "success": True,
-                        "message": "API keys updated successfully",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    await websocket.send(json.dumps(response))
-                    print(f"✅ Updated API keys for {self.current_session_id}")
-                    
                 except Exception as validation_error:
                     # Send validation error
                     response = {
@@ -572,14 +600,42 @@ class WebSocketHandler:
                         "message": str(validation_error),
                         "timestamp": datetime.now().isoformat()
                     }
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(_json_dumps(response))
                     print(f"❌ API key validation error: {validation_error}")
+                    return
+                
+                # Send success response
+                response = {
+                    "type": MessageType.API_KEYS_UPDATED.value,
+                    "success": True,
+                    "message": "API keys updated successfully",
+                    "timestamp": datetime.now().isoformat()
+                }
+                await websocket.send(_json_dumps(response))
+                print(f"✅ Updated API keys for {self.current_session_id}")
+                
+                # Let every connected client refresh its key status, encoded once for all;
+                # the keys are already saved, so a failure here is only logged
+                try:
+                    await self.server.broadcast_message(self._api_keys_status_message())
+                except Exception as e:
+                    print(f"⚠️ Failed to broadcast API key status: {e}")
             else:
                 await self._send_error(websocket, "API key manager not available", None)
                 
         except Exception as e:
             await self._send_error(websocket, f"Failed to set API keys: {e}", None)
     
+    def _api_keys_status_message(self) -> Dict[str, Any]:
+        """Build the message telling clients which API keys are configured."""
+        keys = self.server.api_key_manager.get_api_keys(masked=True)
+        return {
+            "type": MessageType.API_KEYS_STATUS.value,
+            "has_openai_key": bool(keys.get('openai_key', '')),
+            "has_gemini_key": bool(keys.get('gemini_key', '')),
+            "timestamp": datetime.now().isoformat()
+        }
+    
     async def _handle_list_kb_records(self, websocket, data: Dict[str, Any]) -> None:
         """Handle list KB records request."""
         try:
@@ -591,7 +647,7 @@ class WebSocketHandler:
                     "records": records,
                     "timestamp": datetime.now().isoformat()
                 }
-                await websocket.send(json.dumps(response))
+                await websocket.send(_json_dumps(response))
                 print(f"📚 Sent {len(records)} KB records to {self.current_session_id}")
             else:
                 await self._send_error(websocket, "Knowledge base not available", None)
@@ -619,7 +675,7 @@ class WebSocketHandler:
                     "title": title,
                     "timestamp": datetime.now().isoformat()
                 }
-                await websocket.send(json.dumps(response))
+                await websocket.send(_json_dumps(response))
                 print(f"✅ Created KB record '{title}' ({doc_id}) for {self.current_session_id}")
                 
                 # Update the server's knowledge base reference if needed
@@ -653,7 +709,7 @@ class WebSocketHandler:
                         "title": title,
                         "timestamp": datetime.now().isoformat()
                     }
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(_json_dumps(response))
                     print(f"✅ Updated KB record {doc_id} for {self.current_session_id}")
                 else:
                     await self._send_error(websocket, f"Document {doc_id} not found", None)
@@ -682,7 +738,7 @@ class WebSocketHandler:
                         "doc_id": doc_id,
                         "timestamp": datetime.now().isoformat()
                     }
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(_json_dumps(response))
                     print(f"🗑️ Deleted KB record {doc_id} for {self.current_session_id}")
                 else:
                     await self._send_error(websocket, f"Document {doc_id} not found", None)
@@ -714,7 +770,7 @@ class WebSocketHandler:
                     "updated_at": doc.updated_at.isoformat(),
                     "timestamp": datetime.now().isoformat()
                 }
-                await websocket.send(json.dumps(response))
+                await websocket.send(_json_dumps(response))
                 print(f"📄 Sent KB record {doc_id} to {self.current_session_id}")
             else:
                 await self._send_error(websocket, f"Document {doc_id} not found", None)
@@ -730,7 +786,7 @@ class WebSocketHandler:
             "request_id": request_id,
             "timestamp": datetime.now().isoformat()
         }
-        await websocket.send(json.dumps(message))
+        await websocket.send(_json_dumps(message))
     
     def _validate_message(self, data: Dict[str, Any]) -> bool:
         """Validate incoming message format."""
@@ -738,7 +794,7 @@ class WebSocketHandler:
             return False
         
         message_type = data.get("type")
-        if message_type not in [mt.value for mt in MessageType]:
+        if not isinstance(message_type, str) or message_type not in self._MESSAGE_TYPES:
             return False
         
         if message_type == MessageType.QUESTION.value:
@@ -850,12 +906,37 @@ class LiveQAServer:
         self.http_server = None
         self.start_time: Optional[datetime] = None
         self.active_connections: Set = set()
+        self._clients_available = asyncio.Event()  # Set while any client is connected
         self.current_intent: str = ""  # Global intent for all sessions
         self.recording_enabled: bool = False  # Recording state - start disabled
         self.main_app = None  # Reference to main application
         self.knowledge_base = None  # Optional knowledge base
         self.api_key_manager = None  # API key manager
         
+        # Resolve optional collaborator capabilities once rather than per loop iteration
+        self._generate_questions = getattr(qa_handler, 'generate_contextual_questions', None)
+        self._handler_tracks_intent = hasattr(qa_handler, 'session_intent')
+        self._resume_recording = None
+        self._pause_recording = None
+        
+        # Broadcast coalescing: bursts queued within the window go out as one frame
+        self.broadcast_coalesce_window: float = 0.02  # seconds
+        self._pending_broadcasts: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # WebSocket transport tuning for a small-message broadcast workload.
+        # permessage-deflate would recompress every broadcast once per client,
+        # so it stays off; incoming queues and outgoing buffers are bounded so
+        # a slow client cannot grow memory without limit.
+        self.ws_options: Dict[str, Any] = {
+            'compression': None,
+            'max_queue': 8,
+            'max_size': 2 ** 20,
+            'write_limit': 2 ** 18,
+            'ping_interval': 30,
+            'ping_timeout': 20,
+        }
+        
         # Find the web interface file
         self.interface_file_path = self._find_web_interface_file()
         
@@ -915,6 +996,7 @@ class LiveQAServer:
         async def connection_handler(websocket):
             print(f"🌐 WebSocket connection attempt from {websocket.remote_address}")
             self.active_connections.add(websocket)
+            self._clients_available.set()
             try:
                 print(f"🔧 Creating WebSocket handler for {websocket.remote_address}")
                 if self.qa_handler is None:
@@ -940,11 +1022,15 @@ class LiveQAServer:
                     pass
             finally:
                 self.active_connections.discard(websocket)
+                if not self.active_connections:
+                    self._clients_available.clear()
                 print(f"🧹 Connection handler cleanup complete for {websocket.remote_address}")
         
         print(f"Starting Live Q&A server on {self.host}:{self.port}")
         try:
-            self.server = await websockets.serve(connection_handler, self.host, self.port)
+            self.server = await websockets.serve(
+                connection_handler, self.host, self.port, **self.ws_options
+            )
             print(f"✅ WebSocket server successfully bound to {self.host}:{self.port}")
             print(f"🔄 WebSocket server waiting for connections...")
             
@@ -968,13 +1054,18 @@ class LiveQAServer:
         if hasattr(self, '_background_tasks'):
             for task in self._background_tasks:
                 task.cancel()
+        
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._pending_broadcasts = []
     
     async def broadcast_message(self, message: Dict[str, Any]) -> None:
         """Broadcast message to all connected clients."""
         if not self.active_connections:
             return
         
-        message_json = json.dumps(message)
+        # Serialize once and share the same payload across all clients
+        message_json = _json_dumps(message)
         disconnected = set()
         
         for websocket in self.active_connections:
@@ -988,9 +1079,39 @@ class LiveQAServer:
         
         # Remove disconnected clients
         self.active_connections -= disconnected
+        if not self.active_connections:
+            self._clients_available.clear()
+    
+    async def queue_broadcast(self, message: Dict[str, Any]) -> None:
+        """Queue message for the next coalesced broadcast frame."""
+        self._pending_broadcasts.append(message)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_soon())
+    
+    async def _flush_soon(self) -> None:
+        """Wait for the coalescing window, then send all queued messages at once."""
+        await asyncio.sleep(self.broadcast_coalesce_window)
+        await self.flush_broadcasts()
+    
+    async def flush_broadcasts(self) -> None:
+        """Send queued broadcasts, wrapping multiple messages in one batch envelope."""
+        pending, self._pending_broadcasts = self._pending_broadcasts, []
+        if not pending:
+            return
+        
+        if len(pending) == 1:
+            await self.broadcast_message(pending[0])
+        else:
+            await self.broadcast_message({
+                "type": MessageType.BATCH.value,
+                "items": pending
+            })
     
     async def broadcast_transcript(self, transcription) -> None:
         """Broadcast new transcription to all clients."""
+        if not self.active_connections:
+            return
+        
         message = {
             "type": MessageType.TRANSCRIPT.value,
             "content": {
@@ -999,10 +1120,13 @@ class LiveQAServer:
                 "batch_id": transcription.batch_id
             }
         }
-        await self.broadcast_message(message)
+        await self.queue_broadcast(message)
     
     async def broadcast_insight(self, insight) -> None:
         """Broadcast new insight to all clients."""
+        if not self.active_connections:
+            return
+        
         message = {
             "type": MessageType.INSIGHT.value,
             "content": {
@@ -1012,10 +1136,13 @@ class LiveQAServer:
                 "timestamp": insight.timestamp.isoformat()
             }
         }
-        await self.broadcast_message(message)
+        await self.queue_broadcast(message)
     
     async def broadcast_suggested_questions(self, questions: List[str]) -> None:
         """Broadcast suggested questions to all clients."""
+        if not self.active_connections:
+            return
+        
         message = {
             "type": MessageType.SUGGESTED_QUESTIONS.value,
             "content": {
@@ -1023,7 +1150,7 @@ class LiveQAServer:
                 "timestamp": datetime.now().isoformat()
             }
         }
-        await self.broadcast_message(message)
+        await self.queue_broadcast(message)
     
     def get_health_status(self) -> Dict[str, Any]:
         """Get server health status."""
@@ -1096,14 +1223,17 @@ class LiveQAServer:
         await asyncio.sleep(10)  # Initial delay to let some transcripts accumulate
         
         while self.is_running:
+            # Don't spend Gemini calls on questions nobody will see
+            await self._clients_available.wait()
+            
             try:
-                if self.qa_handler and hasattr(self.qa_handler, 'generate_contextual_questions'):
+                if self._generate_questions is not None:
                     # Update QA handler with current intent if it has changed
-                    if hasattr(self.qa_handler, 'session_intent') and self.qa_handler.session_intent != self.current_intent:
+                    if self._handler_tracks_intent and self.qa_handler.session_intent != self.current_intent:
                         self.qa_handler.set_session_intent(self.current_intent)
                     
                     print("🔄 Generating contextual questions...")
-                    questions = await self.qa_handler.generate_contextual_questions()
+                    questions = await self._generate_questions()
                     if questions:
                         print(f"📝 Generated questions: {questions}")
                         await self.broadcast_suggested_questions(questions)
@@ -1132,8 +1262,8 @@ class LiveQAServer:
                 print("🎙️ Recording enabled via web interface")
                 
                 # Notify main app to resume processing if available
-                if self.main_app and hasattr(self.main_app, 'resume_recording'):
-                    await self.main_app.resume_recording()
+                if self._resume_recording is not None:
+                    await self._resume_recording()
                 
                 return True
                 
@@ -1146,8 +1276,8 @@ class LiveQAServer:
                 print("🛑 Recording disabled via web interface")
                 
                 # Notify main app to pause processing if available
-                if self.main_app and hasattr(self.main_app, 'pause_recording'):
-                    await self.main_app.pause_recording()
+                if self._pause_recording is not None:
+                    await self._pause_recording()
                 
                 return True
             
@@ -1162,6 +1292,8 @@ class LiveQAServer:
     def set_main_app(self, main_app) -> None:
         """Set reference to main application for recording control."""
         self.main_app = main_app
+        self._resume_recording = getattr(main_app, 'resume_recording', None)
+        self._pause_recording = getattr(main_app, 'pause_recording', None)
         print("🔗 Main app reference set for recording control")
 
 
@@ -4,20 +4,36 @@ import asyncio
 import os
 import signal
 import sys
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import argparse
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from dotenv import load_dotenv
 
-from .audio_capture import AudioCapture, AudioCaptureConfig
-from .batching import BatchProcessor, BatchingConfig
-from .config import TranscriptionConfig
-from .transcription import TranscriptionManager
-from .gemini_integration import (
-    GeminiClient, GeminiConfig, ContextManager,
-    QAHandler, InsightGenerator
-)
-from .live_qa import LiveQAServer, run_qa_server
+if TYPE_CHECKING:
+    from .audio_capture import AudioCapture
+    from .batching import BatchProcessor
+    from .transcription import TranscriptionManager
+    from .gemini_integration import (
+        GeminiClient, ContextManager, QAHandler, InsightGenerator
+    )
+    from .live_qa import LiveQAServer
+
+
+def _hms(dt: datetime) -> str:
+    """Format a timestamp as HH:MM:SS without going through strftime."""
+    return f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+@dataclass
+class AppStats:
+    """Running counters for the application's hot paths."""
+    
+    audio_chunks_processed: int = 0
+    batches_created: int = 0
+    transcriptions_completed: int = 0
+    questions_answered: int = 0
+    insights_generated: int = 0
 
 
 class LiveTranscriptsApp:
@@ -39,24 +55,35 @@ class LiveTranscriptsApp:
         
         # Tasks
         self.tasks = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shutdown = asyncio.Event()
+        
+        # Insights are handed off from a sync callback to one long-lived broadcaster
+        self._insight_outbox: asyncio.Queue = asyncio.Queue()
         
         # Recording state
         self.recording_paused: bool = True  # Start with recording paused
         
         # Statistics
         self.start_time: Optional[datetime] = None
-        self.stats = {
-            'audio_chunks_processed': 0,
-            'batches_created': 0,
-            'transcriptions_completed': 0,
-            'questions_answered': 0,
-            'insights_generated': 0
-        }
+        self.stats = AppStats()
     
     def initialize(self) -> None:
         """Initialize all components."""
         print("Initializing Live Transcripts...")
         
+        # Heavy SDK-backed modules are imported here so --help and test
+        # discovery don't pay for them
+        from .audio_capture import AudioCapture, AudioCaptureConfig
+        from .batching import BatchProcessor, BatchingConfig
+        from .config import TranscriptionConfig
+        from .transcription import TranscriptionManager
+        from .gemini_integration import (
+            GeminiClient, GeminiConfig, ContextManager,
+            QAHandler, InsightGenerator
+        )
+        from .live_qa import LiveQAServer
+        
         # Get API key (Google API key for both transcription and Q&A)
         google_key = os.getenv('GOOGLE_API_KEY')
 
@@ -141,6 +168,7 @@ class LiveTranscriptsApp:
         print("Starting Live Transcripts application...")
         self.is_running = True
         self.start_time = datetime.now()
+        self._loop = asyncio.get_running_loop()
         
         # Start components
         try:
@@ -157,6 +185,10 @@ class LiveTranscriptsApp:
             await self.transcription_manager.start_processing()
             print("✓ Transcription processing started")
             
+            # Start insight broadcaster
+            outbox_task = asyncio.create_task(self._insight_broadcast_loop())
+            self.tasks.append(outbox_task)
+            
             # Start automated insights
             insight_callback = self._on_insight_generated
             insight_task = asyncio.create_task(
@@ -191,17 +223,26 @@ class LiveTranscriptsApp:
             print(f"\n👉 Open http://localhost:{self.qa_server.http_port} in your browser for Q&A!")
             print("\nPress Ctrl+C to stop...")
             
-            # Wait for all tasks
-            await asyncio.gather(*self.tasks, return_exceptions=True)
+            # Run until shutdown is requested, then tear down once
+            await self._shutdown.wait()
+            await self.stop()
             
         except Exception as e:
             print(f"✗ Runtime error: {e}")
             raise
     
+    def request_shutdown(self) -> None:
+        """Ask the running application to shut down; safe to call repeatedly."""
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._shutdown.set)
+        else:
+            self._shutdown.set()
+    
     async def stop(self) -> None:
         """Stop the application gracefully."""
         print("\nStopping Live Transcripts...")
         self.is_running = False
+        self._wake_audio_loop()
         
         # Stop components in reverse order
         if self.qa_server:
@@ -214,6 +255,7 @@ class LiveTranscriptsApp:
         
         if self.transcription_manager:
             await self.transcription_manager.stop_processing()
+            await self.transcription_manager.close()
             print("✓ Transcription processing stopped")
         
         if self.batch_processor:
@@ -243,29 +285,22 @@ class LiveTranscriptsApp:
                     await asyncio.sleep(0.1)  # Longer delay when paused
                     continue
                 
-                # Get audio data
-                try:
-                    audio_chunk = await asyncio.wait_for(
-                        self.audio_capture.get_audio_chunk(),
-                        timeout=0.1
-                    )
-                    # Process through batching system
-                    await self.batch_processor.process_audio_chunk(audio_chunk.data)
-                    self.stats['audio_chunks_processed'] += 1
-                    
-                except asyncio.TimeoutError:
-                    # No audio available, continue
-                    pass
+                # Get audio data, waiting for the producer if none is queued
+                audio_chunk = self.audio_capture.get_audio_chunk_nowait()
+                if audio_chunk is None:
+                    await self.audio_capture.chunk_available.wait()
+                    continue
+                
+                # Process through batching system
+                await self.batch_processor.process_audio_chunk(audio_chunk.data)
+                self.stats.audio_chunks_processed += 1
                 
                 # Check for new batches (only when recording is active)
                 batch = await self.batch_processor.get_next_batch()
                 if batch:
                     # Send for transcription
                     await self.transcription_manager.transcribe_batch(batch)
-                    self.stats['batches_created'] += 1
-                
-                # Small delay to prevent overwhelming
-                await asyncio.sleep(0.01)  # 10ms
+                    self.stats.batches_created += 1
                 
         except Exception as e:
             print(f"Audio processing error: {e}")
@@ -273,15 +308,16 @@ class LiveTranscriptsApp:
     
     async def _intent_sync_loop(self) -> None:
         """Synchronize intent between Q&A server and insight generator."""
+        # Both sides must expose an intent; resolve that once, not on every tick
+        if not (self.qa_server and hasattr(self.qa_server, 'current_intent') and
+                self.insight_generator and hasattr(self.insight_generator, 'session_intent')):
+            return
+        
         try:
             while self.is_running:
-                # Check if Q&A server has a current intent
-                if (self.qa_server and hasattr(self.qa_server, 'current_intent') and 
-                    self.insight_generator and hasattr(self.insight_generator, 'session_intent')):
-                    
-                    current_intent = self.qa_server.current_intent
-                    if self.insight_generator.session_intent != current_intent:
-                        self.insight_generator.set_session_intent(current_intent)
+                current_intent = self.qa_server.current_intent
+                if self.insight_generator.session_intent != current_intent:
+                    self.insight_generator.set_session_intent(current_intent)
                 
                 # Check every 5 seconds
                 await asyncio.sleep(5)
@@ -292,6 +328,7 @@ class LiveTranscriptsApp:
     async def pause_recording(self) -> None:
         """Pause audio recording and processing."""
         self.recording_paused = True
+        self._wake_audio_loop()
         print("⏸️ Recording paused - audio processing stopped")
     
     async def resume_recording(self) -> None:
@@ -299,19 +336,24 @@ class LiveTranscriptsApp:
         self.recording_paused = False
         print("▶️ Recording resumed - audio processing active")
     
+    def _wake_audio_loop(self) -> None:
+        """Wake the audio loop if it is waiting for a chunk, so it sees pause and stop."""
+        if self.audio_capture:
+            self.audio_capture.chunk_available.set()
+    
     async def _on_transcription_result(self, result) -> None:
         """Handle new transcription result."""
         try:
             # Add to context
             self.context_manager.add_transcription(result)
-            self.stats['transcriptions_completed'] += 1
+            self.stats.transcriptions_completed += 1
             
             # Broadcast to connected clients
             if self.qa_server:
                 await self.qa_server.broadcast_transcript(result)
             
             # Print to console
-            timestamp = result.timestamp.strftime("%H:%M:%S")
+            timestamp = _hms(result.timestamp)
             print(f"[{timestamp}] {result.text}")
             
         except Exception as e:
@@ -320,19 +362,28 @@ class LiveTranscriptsApp:
     def _on_insight_generated(self, insight) -> None:
         """Handle new insight generation."""
         try:
-            self.stats['insights_generated'] += 1
+            self.stats.insights_generated += 1
             
             # Broadcast to connected clients
-            if self.qa_server:
-                asyncio.create_task(self.qa_server.broadcast_insight(insight))
+            if self.qa_server and self._loop:
+                self._loop.call_soon_threadsafe(self._insight_outbox.put_nowait, insight)
             
             # Print to console
-            timestamp = insight.timestamp.strftime("%H:%M:%S")
+            timestamp = _hms(insight.timestamp)
             print(f"\n💡 [{timestamp}] {insight.type.value.upper()}: {insight.content}\n")
             
         except Exception as e:
             print(f"Insight callback error: {e}")
     
+    async def _insight_broadcast_loop(self) -> None:
+        """Broadcast insights queued by the insight callback."""
+        while True:
+            insight = await self._insight_outbox.get()
+            try:
+                await self.qa_server.broadcast_insight(insight)
+            except Exception as e:
+                print(f"Insight broadcast error: {e}")
+    
     def get_statistics(self) -> dict:
         """Get application statistics."""
         uptime = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0
@@ -340,7 +391,7 @@ class LiveTranscriptsApp:
         base_stats = {
             'uptime_seconds': uptime,
             'is_running': self.is_running,
-            **self.stats
+            **asdict(self.stats)
         }
         
         # Add component statistics
@@ -382,8 +433,9 @@ async def main():
     
     # Set up signal handlers for graceful shutdown
     def signal_handler():
-        print("\nReceived shutdown signal...")
-        asyncio.create_task(app.stop())
+        if not app._shutdown.is_set():
+            print("\nReceived shutdown signal...")
+        app.request_shutdown()
     
     if sys.platform != 'win32':
         loop = asyncio.get_event_loop()
@@ -418,4 +470,11 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Run the application
+    # Use uvloop's faster event loop where it is available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
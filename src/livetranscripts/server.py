@@ -5,8 +5,6 @@ import os
 import sys
 import argparse
 from dotenv import load_dotenv
-from .gemini_integration import GeminiClient, GeminiConfig, ContextManager, QAHandler
-from .live_qa import run_qa_server
 
 
 async def main():
@@ -25,6 +23,10 @@ async def main():
         print("Set with: export GOOGLE_API_KEY='your-api-key'")
         sys.exit(1)
     
+    # Deferred so argument parsing doesn't load the Gemini SDK
+    from .gemini_integration import GeminiClient, GeminiConfig, ContextManager, QAHandler
+    from .live_qa import run_qa_server
+    
     # Initialize Gemini components
     try:
         config = GeminiConfig()
@@ -53,4 +55,12 @@ async def main():
 if __name__ == "__main__":
     # Load environment variables from .env file
     load_dotenv()
+    
+    # Use uvloop's faster event loop where it is available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
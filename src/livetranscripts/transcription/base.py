@@ -1,19 +1,31 @@
 """Base transcription interface and shared types."""
 
-from abc import ABC, abstractmethod
-from typing import Dict, Any
-from ..whisper_integration import TranscriptionResult
+import asyncio
+from typing import Dict, Any, TYPE_CHECKING
+from ..whisper_integration import RequestStatsMixin, TranscriptionResult, TokenBucket
 from ..config import TranscriptionConfig
 
 
-class TranscriptionClient(ABC):
-    """Abstract base class for transcription clients."""
+class TranscriptionClient(RequestStatsMixin):
+    """Base class for transcription clients.
+    
+    Declared with ``__slots__`` instead of as an ``ABC`` to keep per-batch
+    attribute access cheap. Subclasses must override ``transcribe_wav`` and
+    ``get_statistics`` and declare ``__slots__`` for any attributes they add.
+    Subclasses keep their request counters in a ``_stats`` dict.
+    """
+    
+    __slots__ = ("config", "api_key", "_rate_limiter")
     
     def __init__(self, config: TranscriptionConfig, api_key: str):
         self.config = config
         self.api_key = api_key
+        # Bursts up to the allowed concurrency, then paced to requests_per_minute
+        self._rate_limiter = (
+            TokenBucket(config.requests_per_minute / 60, burst=config.max_concurrent_requests)
+            if config.requests_per_minute else None
+        )
     
-    @abstractmethod
     async def transcribe_batch(self, batch) -> TranscriptionResult:
         """Transcribe an audio batch.
         
@@ -23,13 +35,41 @@ class TranscriptionClient(ABC):
         Returns:
             TranscriptionResult containing transcribed text and metadata
         """
-        pass
+        # Preprocessing and encoding are CPU-bound; keep them off the event loop
+        wav_bytes = await asyncio.to_thread(getattr, batch, "wav_bytes")
+        return await self.transcribe_wav(wav_bytes, batch)
+    
+    async def transcribe_wav(self, wav_bytes: bytes, batch) -> TranscriptionResult:
+        """Transcribe audio that has already been preprocessed and WAV-encoded.
+        
+        Args:
+            wav_bytes: Encoded audio for the batch
+            batch: Audio batch the audio belongs to (for timing and ids)
+            
+        Returns:
+            TranscriptionResult containing transcribed text and metadata
+        """
+        raise NotImplementedError
     
-    @abstractmethod
     def get_statistics(self) -> Dict[str, Any]:
         """Get transcription statistics.
         
         Returns:
             Dictionary containing statistics about transcription performance
         """
-        pass
\ No newline at end of file
+        raise NotImplementedError
+
+
+if TYPE_CHECKING:
+    from typing import Protocol
+    
+    class TranscriptionClientProtocol(Protocol):
+        """Structural type for static checkers; not checked at runtime."""
+        
+        config: TranscriptionConfig
+        
+        async def transcribe_batch(self, batch) -> TranscriptionResult: ...
+        
+        async def transcribe_wav(self, wav_bytes: bytes, batch) -> TranscriptionResult: ...
+        
+        def get_statistics(self) -> Dict[str, Any]: ...
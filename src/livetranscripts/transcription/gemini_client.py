@@ -1,26 +1,38 @@
 """Gemini transcription client."""
 
 import asyncio
+import functools
 import io
 import time
-import wave
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
-import numpy as np
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 from .base import TranscriptionClient
 from ..whisper_integration import (
     TranscriptionResult,
     TranscriptionSegment,
-    AudioProcessor,
     RetryManager
 )
 from ..config import TranscriptionConfig
 
+# Gemini caps the whole inline request at 20 MB, counted after the audio is
+# base64-encoded (4/3 its size) and the prompt is added; 15 MB of WAV
+# encodes to exactly 20 MB, so stay just under that
+INLINE_AUDIO_LIMIT = 14 * 1024 * 1024
+
+
+def _is_retryable_gemini_error(error: Exception) -> bool:
+    """Return False for Gemini errors that retrying cannot fix."""
+    return not isinstance(error, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied))
+
 
 class GeminiClient(TranscriptionClient):
     """Google Gemini transcription client."""
 
+    __slots__ = ("model", "_prompt", "_stats", "_executor", "_request_slots")
+
     def __init__(self, config: TranscriptionConfig, api_key: str):
         super().__init__(config, api_key)
         genai.configure(api_key=api_key)
@@ -29,95 +41,81 @@ class GeminiClient(TranscriptionClient):
         model_name = self.config.transcription_model.replace("-transcribe", "")
         self.model = genai.GenerativeModel(model_name)
 
+        # Transcription prompt, with a language hint if specified
+        if self.config.whisper_language:
+            self._prompt = f"Transcribe this audio in {self.config.whisper_language}. Provide only the transcription text without any additional commentary."
+        else:
+            self._prompt = "Transcribe this audio accurately. Provide only the transcription text without any additional commentary."
+
+        # File uploads are synchronous in the genai SDK; run them on a pool of our
+        # own so bursts of batches can't starve the loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrent_requests,
+            thread_name_prefix="gemini-transcribe"
+        )
+        self._request_slots = asyncio.Semaphore(self.config.max_concurrent_requests)
+
         self._stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cancelled_requests': 0,
             'total_audio_duration': 0.0,
-            'total_processing_time': 0.0
+            'total_processing_time': 0.0,
+            'average_processing_time': 0.0,
+            'success_rate': 0.0
         }
 
-    async def transcribe_batch(self, batch) -> TranscriptionResult:
-        """Transcribe an audio batch using Gemini."""
-        from ..batching import AudioBatch  # Import here to avoid circular import
-
+    async def transcribe_wav(self, wav_bytes: bytes, batch) -> TranscriptionResult:
+        """Transcribe already preprocessed and encoded audio using Gemini."""
         start_time = time.time()
         self._stats['total_requests'] += 1
         self._stats['total_audio_duration'] += batch.duration
 
         try:
-            # Preprocess audio
-            processed_audio = self._preprocess_audio(batch.audio_data)
-
-            # Convert to WAV bytes
-            wav_bytes = AudioProcessor.audio_to_wav_bytes(processed_audio)
-
             # Make API call with retry logic
             response = await self._make_transcription_request(wav_bytes, batch)
 
             # Process response
             result = self._process_response(response, batch)
 
-            self._stats['successful_requests'] += 1
-            self._stats['total_processing_time'] += time.time() - start_time
+            self._record_success(time.time() - start_time)
 
             return result
 
+        except asyncio.CancelledError:
+            # Abandoned before finishing, e.g. the losing side of a hedged race
+            self._record_cancelled()
+            raise
         except Exception as e:
             self._stats['failed_requests'] += 1
+            self._update_success_rate()
             raise e
 
-    def _preprocess_audio(self, audio_data: np.ndarray) -> np.ndarray:
-        """Preprocess audio before transcription."""
-        if len(audio_data) == 0:
-            return audio_data
-
-        # Normalize to prevent clipping
-        processed = AudioProcessor.normalize_audio(audio_data)
-
-        # Apply basic filters
-        processed = AudioProcessor.apply_filters(processed)
-
-        return processed
-
-    @RetryManager.async_retry(max_retries=3, base_delay=1.0)
+    @RetryManager.async_retry(max_retries=3, base_delay=1.0, retry_on=_is_retryable_gemini_error)
     async def _make_transcription_request(self, wav_bytes: bytes, batch):
         """Make the actual transcription request with retry."""
-        import tempfile
-        import os as os_module
-
-        # Gemini requires a file path, so write to temp file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            tmp_file.write(wav_bytes)
-            tmp_path = tmp_file.name
-
-        try:
-            # Upload audio file to Gemini
-            loop = asyncio.get_event_loop()
-            audio_file = await loop.run_in_executor(
-                None,
-                lambda: genai.upload_file(path=tmp_path, mime_type="audio/wav")
-            )
-
-            # Create transcription prompt
-            prompt = "Transcribe this audio accurately. Provide only the transcription text without any additional commentary."
-
-            # Add language hint if specified
-            if self.config.whisper_language:
-                prompt = f"Transcribe this audio in {self.config.whisper_language}. Provide only the transcription text without any additional commentary."
-
-            # Generate transcription (run in executor since it's synchronous)
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.model.generate_content([prompt, audio_file])
-            )
-
-            return response
-
-        finally:
-            # Clean up temp file
-            if os_module.path.exists(tmp_path):
-                os_module.unlink(tmp_path)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+
+        # Hold a slot only while talking to the API, not across retry backoff
+        async with self._request_slots:
+            # Small clips go inline with the request; larger ones are uploaded
+            # from memory through the File API. Neither touches the disk.
+            if len(wav_bytes) < INLINE_AUDIO_LIMIT:
+                audio_part = {"mime_type": "audio/wav", "data": wav_bytes}
+            else:
+                audio_part = await self._run_blocking(
+                    genai.upload_file, path=io.BytesIO(wav_bytes), mime_type="audio/wav"
+                )
+
+            # Generate transcription with the SDK's native async call (no thread hop)
+            return await self.model.generate_content_async([self._prompt, audio_part])
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a synchronous SDK call on the client's dedicated executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
 
     def _process_response(self, response, batch) -> TranscriptionResult:
         """Process Gemini API response into TranscriptionResult."""
@@ -141,19 +139,18 @@ class GeminiClient(TranscriptionClient):
             timestamp=batch.timestamp
         )
 
+    def close(self) -> None:
+        """Release the client's worker threads."""
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        self.close()
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get transcription statistics."""
-        stats = self._stats.copy()
-
-        if stats['successful_requests'] > 0:
-            stats['average_processing_time'] = (
-                stats['total_processing_time'] / stats['successful_requests']
-            )
-            stats['success_rate'] = (
-                stats['successful_requests'] / stats['total_requests']
-            )
-        else:
-            stats['average_processing_time'] = 0.0
-            stats['success_rate'] = 0.0
-
-        return stats
\ No newline at end of file
+        return self._stats.copy()
\ No newline at end of file
@@ -1,19 +1,16 @@
 """GPT-4o transcription client."""
 
 import asyncio
-import io
 import time
-import wave
-from typing import Dict, Any
-import numpy as np
-import openai
+from typing import Dict, Any, Tuple
 
 from .base import TranscriptionClient
 from ..whisper_integration import (
     TranscriptionResult,
     TranscriptionSegment,
-    AudioProcessor,
-    RetryManager
+    RetryManager,
+    create_openai_http_client,
+    is_retryable_error
 )
 from ..config import TranscriptionConfig
 
@@ -21,35 +18,37 @@ from ..config import TranscriptionConfig
 class GPT4oClient(TranscriptionClient):
     """OpenAI GPT-4o transcription client."""
     
+    __slots__ = ("client", "_stats")
+    
     def __init__(self, config: TranscriptionConfig, api_key: str):
         super().__init__(config, api_key)
-        self.client = openai.AsyncOpenAI(api_key=api_key)
+        # Imported here so the SDK's import cost is paid only when a client is built
+        import openai
+        # Retries are handled by RetryManager; SDK retries would multiply them
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key, http_client=create_openai_http_client(), max_retries=0
+        )
         self._stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cancelled_requests': 0,
             'total_audio_duration': 0.0,
-            'total_processing_time': 0.0
+            'total_processing_time': 0.0,
+            'average_processing_time': 0.0,
+            'success_rate': 0.0
         }
     
-    async def transcribe_batch(self, batch) -> TranscriptionResult:
-        """Transcribe an audio batch using GPT-4o."""
-        from ..batching import AudioBatch  # Import here to avoid circular import
-        
+    async def transcribe_wav(self, wav_bytes: bytes, batch) -> TranscriptionResult:
+        """Transcribe already preprocessed and encoded audio using GPT-4o."""
         start_time = time.time()
         self._stats['total_requests'] += 1
         self._stats['total_audio_duration'] += batch.duration
         
         try:
-            # Preprocess audio
-            processed_audio = self._preprocess_audio(batch.audio_data)
-            
-            # Convert to WAV bytes
-            wav_bytes = AudioProcessor.audio_to_wav_bytes(processed_audio)
-            
-            # Create file-like object
-            audio_file = io.BytesIO(wav_bytes)
-            audio_file.name = f"batch_{batch.sequence_id}.wav"
+            # The SDK sends bytes straight into the multipart body, with no file
+            # object to read through in chunks, and can resend them on retry
+            audio_file = (f"batch_{batch.sequence_id}.wav", wav_bytes, "audio/wav")
             
             # Prepare request parameters
             params = self._format_request_parameters()
@@ -60,33 +59,26 @@ class GPT4oClient(TranscriptionClient):
             # Process response
             result = self._process_response(response, batch)
             
-            self._stats['successful_requests'] += 1
-            self._stats['total_processing_time'] += time.time() - start_time
+            self._record_success(time.time() - start_time)
             
             return result
             
+        except asyncio.CancelledError:
+            # Abandoned before finishing, e.g. the losing side of a hedged race
+            self._record_cancelled()
+            raise
         except Exception as e:
             self._stats['failed_requests'] += 1
+            self._update_success_rate()
             raise e
     
-    def _preprocess_audio(self, audio_data: np.ndarray) -> np.ndarray:
-        """Preprocess audio before transcription."""
-        if len(audio_data) == 0:
-            return audio_data
-        
-        # Normalize to prevent clipping
-        processed = AudioProcessor.normalize_audio(audio_data)
-        
-        # Apply basic filters
-        processed = AudioProcessor.apply_filters(processed)
-        
-        return processed
-    
     def _format_request_parameters(self) -> Dict[str, Any]:
         """Format parameters for GPT-4o transcription API request."""
         params = {
             "model": self.config.transcription_model,
-            "response_format": "verbose_json",
+            # GPT-4o transcription models only return plain "json" (no segments),
+            # which is also the smallest payload to send and parse
+            "response_format": "json",
             "temperature": 0.0,  # Use deterministic output for transcription
         }
         
@@ -96,9 +88,11 @@ class GPT4oClient(TranscriptionClient):
         
         return params
     
-    @RetryManager.async_retry(max_retries=3, base_delay=1.0)
-    async def _make_transcription_request(self, audio_file: io.BytesIO, params: Dict[str, Any]):
+    @RetryManager.async_retry(max_retries=3, base_delay=1.0, retry_on=is_retryable_error)
+    async def _make_transcription_request(self, audio_file: Tuple[str, bytes, str], params: Dict[str, Any]):
         """Make the actual transcription request with retry."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
         return await self.client.audio.transcriptions.create(
             file=audio_file,
             **params
@@ -129,25 +123,16 @@ class GPT4oClient(TranscriptionClient):
         return TranscriptionResult(
             text=response.text.strip(),
             segments=segments,
-            language=getattr(response, 'language', 'unknown'),
+            language=getattr(response, 'language', None) or self.config.whisper_language or 'unknown',
             duration=batch.duration,
             batch_id=batch.sequence_id,
             timestamp=batch.timestamp
         )
     
+    async def close(self) -> None:
+        """Release the client's HTTP connection pool."""
+        await self.client.close()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get transcription statistics."""
-        stats = self._stats.copy()
-        
-        if stats['successful_requests'] > 0:
-            stats['average_processing_time'] = (
-                stats['total_processing_time'] / stats['successful_requests']
-            )
-            stats['success_rate'] = (
-                stats['successful_requests'] / stats['total_requests']
-            )
-        else:
-            stats['average_processing_time'] = 0.0
-            stats['success_rate'] = 0.0
-        
-        return stats
\ No newline at end of file
+        return self._stats.copy()
\ No newline at end of file
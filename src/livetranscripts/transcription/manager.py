@@ -1,19 +1,64 @@
 """Enhanced transcription manager with model fallback support."""
 
 import asyncio
-from typing import List, Optional, Dict, Any, Callable
+import hashlib
+import inspect
+from collections import OrderedDict, deque
+from dataclasses import replace
+from itertools import islice
+from typing import Deque, List, Optional, Dict, Any, Callable
 import logging
 
+try:
+    import xxhash
+except ImportError:  # Optional, installed with the `speedups` extra
+    xxhash = None
+
 from .registry import TranscriptionRegistry
 from .gpt4o_client import GPT4oClient
 from .gemini_client import GeminiClient
-from ..whisper_integration import WhisperClient, TranscriptionResult
+from ..whisper_integration import (
+    OrderedDispatchMixin, WhisperClient, WhisperConfig, TranscriptionResult, _is_silent
+)
 from ..config import TranscriptionConfig
 
 logger = logging.getLogger(__name__)
 
+def _audio_digest(wav_bytes: bytes) -> bytes:
+    """Return a cache key for encoded audio (xxh3 when available, else SHA-256)."""
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(wav_bytes)
+    # Hardware-accelerated on current CPUs; the fastest hashlib option here
+    return hashlib.sha256(wav_bytes).digest()
+
+
+def _transcription_client_config(model_name: str, config: TranscriptionConfig) -> TranscriptionConfig:
+    """Build the config for a GPT-4o or Gemini client."""
+    return TranscriptionConfig(
+        transcription_model=model_name,
+        whisper_language=config.whisper_language,
+        api_timeout=config.api_timeout,
+        max_retries=config.max_retries,
+        retry_delay=config.retry_delay,
+        max_concurrent_requests=config.max_concurrent_requests,
+        requests_per_minute=config.requests_per_minute
+    )
+
+
+def _whisper_client_config(model_name: str, config: TranscriptionConfig) -> WhisperConfig:
+    """Build the config for a Whisper client."""
+    return WhisperConfig(
+        model=model_name,
+        language=config.whisper_language,
+        max_retries=config.max_retries,
+        timeout=config.api_timeout,
+        max_concurrent_batches=config.max_concurrent_requests,
+        requests_per_minute=config.requests_per_minute,
+        silence_peak_threshold=config.silence_peak_threshold
+    )
 
-class TranscriptionManager:
+
+class TranscriptionManager(OrderedDispatchMixin):
     """Manages transcription with model fallback support."""
 
     def __init__(self, config: TranscriptionConfig, api_key: str):
@@ -22,147 +67,214 @@ class TranscriptionManager:
         self.registry = TranscriptionRegistry()
         self._setup_registry()
         self._clients: Dict[str, Any] = {}
+        # Per-client stats are only re-collected after a batch has finished
+        self._client_stats: Dict[str, Dict[str, Any]] = {}
+        self._stats_dirty = True
+        # Recent results keyed by a digest of the encoded audio, oldest first
+        self._result_cache: "OrderedDict[bytes, TranscriptionResult]" = OrderedDict()
 
         # Processing queue and callbacks
-        self.transcription_history: List[TranscriptionResult] = []
-        self.is_processing = False
-        self._processing_queue = asyncio.Queue()
+        self.transcription_history: Deque[TranscriptionResult] = deque(maxlen=config.history_max)
+        self._full_text_parts: List[str] = []
+        self._cached_full_text: Optional[str] = None
+        self._init_dispatch(config.max_concurrent_batches)
         self._result_callbacks: List[Callable] = []
         
     def _setup_registry(self) -> None:
         """Set up the transcription model registry."""
         # Register available models
-        self.registry.register_client("gpt-4o-transcribe", GPT4oClient)
-        self.registry.register_client("gpt-4o-mini-transcribe", GPT4oClient)
-        self.registry.register_client("gemini-2.0-flash-transcribe", GeminiClient)
-        self.registry.register_client("gemini-2.0-flash-lite-transcribe", GeminiClient)
-        self.registry.register_client("gemini-1.5-pro-transcribe", GeminiClient)
-        self.registry.register_client("whisper-1", WhisperClient)
+        self.registry.register_client("gpt-4o-transcribe", GPT4oClient, _transcription_client_config)
+        self.registry.register_client("gpt-4o-mini-transcribe", GPT4oClient, _transcription_client_config)
+        self.registry.register_client("gemini-2.0-flash-transcribe", GeminiClient, _transcription_client_config)
+        self.registry.register_client("gemini-2.0-flash-lite-transcribe", GeminiClient, _transcription_client_config)
+        self.registry.register_client("gemini-1.5-pro-transcribe", GeminiClient, _transcription_client_config)
+        self.registry.register_client("whisper-1", WhisperClient, _whisper_client_config)
     
     def _get_client(self, model_name: str):
         """Get or create a client for the specified model."""
-        if model_name not in self._clients:
+        client = self._clients.get(model_name)
+        if client is None:
             client_class = self.registry.get_client_class(model_name)
+            config_factory = self.registry.get_config_factory(model_name) or _transcription_client_config
+            client = client_class(config_factory(model_name, self.config), self.api_key)
+            self._clients[model_name] = client
 
-            # Create appropriate config for the client
-            if model_name.startswith("gpt-4o") or model_name.startswith("gemini"):
-                # Use TranscriptionConfig for GPT-4o and Gemini clients
-                client_config = TranscriptionConfig(
-                    transcription_model=model_name,
-                    whisper_language=self.config.whisper_language,
-                    api_timeout=self.config.api_timeout,
-                    max_retries=self.config.max_retries,
-                    retry_delay=self.config.retry_delay
-                )
-                self._clients[model_name] = client_class(client_config, self.api_key)
-            else:
-                # Use WhisperConfig for Whisper clients
-                from ..whisper_integration import WhisperConfig
-                whisper_config = WhisperConfig(
-                    model=model_name,
-                    language=self.config.whisper_language,
-                    max_retries=self.config.max_retries,
-                    timeout=self.config.api_timeout
-                )
-                self._clients[model_name] = client_class(whisper_config, self.api_key)
-
-        return self._clients[model_name]
+        return client
     
     async def transcribe_batch_with_fallback(self, batch) -> TranscriptionResult:
-        """Transcribe batch with automatic fallback on failure."""
+        """Transcribe batch with automatic fallback on failure.
+
+        If a model has not answered within ``hedge_delay`` seconds, the next
+        fallback is started alongside it and the first success wins.
+        """
+        # Nothing to transcribe; don't pay for an upload and API round trip
+        if _is_silent(batch.audio_data, self.config.silence_peak_threshold):
+            logger.debug("Skipping silent batch %s", batch.sequence_id)
+            return TranscriptionResult.empty(batch, self.config.whisper_language or 'unknown')
+
+        # Encoded once on the batch and shared across every model attempt; the
+        # CPU-bound preprocessing runs off the event loop
+        wav_bytes = await asyncio.to_thread(getattr, batch, "wav_bytes")
+
+        # Replays and repeated silence are served without another API call
+        cache_key = None
+        if self.config.result_cache_size > 0:
+            cache_key = _audio_digest(wav_bytes)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                logger.debug("Transcription cache hit for batch %s", batch.sequence_id)
+                return replace(cached, batch_id=batch.sequence_id, timestamp=batch.timestamp)
+
         models_to_try = [self.config.transcription_model] + self.config.model_fallback
+        hedge_delay = self.config.hedge_delay
+        pending: Dict[asyncio.Task, str] = {}
         last_exception = None
-        
-        for model_name in models_to_try:
-            try:
-                logger.debug(f"Attempting transcription with {model_name}")
-                client = self._get_client(model_name)
-                result = await client.transcribe_batch(batch)
-                logger.debug(f"Transcription successful with {model_name}")
-                return result
-                
-            except Exception as e:
-                logger.warning(f"Transcription failed with {model_name}: {e}")
-                last_exception = e
-                continue
-        
+
+        def launch_next() -> None:
+            nonlocal last_exception
+            while models_to_try:
+                model_name = models_to_try.pop(0)
+                try:
+                    logger.debug("Attempting transcription with %s", model_name)
+                    client = self._get_client(model_name)
+                    task = asyncio.ensure_future(client.transcribe_wav(wav_bytes, batch))
+                except Exception as e:
+                    logger.warning("Transcription failed with %s: %s", model_name, e)
+                    last_exception = e
+                    continue
+                pending[task] = model_name
+                return
+
+        launch_next()
+        try:
+            while pending:
+                timeout = hedge_delay if models_to_try else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    logger.debug("Hedging transcription after %ss", hedge_delay)
+                    launch_next()
+                    continue
+
+                for task in done:
+                    model_name = pending.pop(task)
+                    if task.exception() is None:
+                        logger.debug("Transcription successful with %s", model_name)
+                        result = task.result()
+                        if cache_key is not None:
+                            self._cache_result(cache_key, result)
+                        return result
+                    logger.warning("Transcription failed with %s: %s", model_name, task.exception())
+                    last_exception = task.exception()
+
+                # Replace the failure with the next fallback
+                launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let the losers record their cancellation before stats are re-read
+                await asyncio.gather(*pending, return_exceptions=True)
+            self._stats_dirty = True
+
         # If all models failed, raise the last exception
         if last_exception:
             raise last_exception
         else:
             raise RuntimeError("No transcription models available")
-    
-    async def transcribe_batch(self, batch) -> None:
-        """Queue a batch for transcription."""
-        if self.is_processing:
-            await self._processing_queue.put(batch)
-
-    async def start_processing(self) -> None:
-        """Start the transcription processing pipeline."""
-        self.is_processing = True
-        asyncio.create_task(self._process_queue())
-
-    async def stop_processing(self) -> None:
-        """Stop the transcription processing pipeline."""
-        self.is_processing = False
-
-    async def _process_queue(self) -> None:
-        """Process batches from the queue."""
-        while self.is_processing:
-            try:
-                # Wait for batch with timeout
-                batch = await asyncio.wait_for(
-                    self._processing_queue.get(),
-                    timeout=1.0
-                )
-
-                # Transcribe batch with fallback
-                result = await self.transcribe_batch_with_fallback(batch)
-
-                # Store result
-                self.transcription_history.append(result)
 
-                # Notify callbacks
-                for callback in self._result_callbacks:
-                    try:
-                        await callback(result)
-                    except Exception as e:
-                        logger.error(f"Callback error: {e}")
+    def _cache_result(self, cache_key: bytes, result: TranscriptionResult) -> None:
+        """Remember a result, evicting the least recently used beyond the limit."""
+        self._result_cache[cache_key] = result
+        if len(self._result_cache) > self.config.result_cache_size:
+            self._result_cache.popitem(last=False)
 
-            except asyncio.TimeoutError:
-                # No batch available, continue
+    async def close(self) -> None:
+        """Release resources held by the cached clients, such as worker threads."""
+        clients, self._clients = self._clients, {}
+        for model_name, client in clients.items():
+            close = getattr(client, "close", None)
+            if close is None:
                 continue
+            try:
+                outcome = close()
+                if inspect.isawaitable(outcome):
+                    await outcome
             except Exception as e:
-                logger.error(f"Transcription error: {e}")
+                logger.warning("Error closing %s client: %s", model_name, e)
+
+    async def _transcribe_work(self, batch) -> TranscriptionResult:
+        """Transcribe one queued batch."""
+        return await self.transcribe_batch_with_fallback(batch)
+
+    async def _deliver_result(self, result: TranscriptionResult) -> None:
+        """Store a result and notify callbacks concurrently."""
+        if not result.text:
+            # Skipped as silent or no speech heard; nothing to record or announce
+            return
+        self._record_result(result)
+        outcomes = await asyncio.gather(
+            *(callback(result) for callback in self._result_callbacks),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error("Callback error: %s", outcome)
+
+    def _record_result(self, result: TranscriptionResult) -> None:
+        """Store a result and invalidate the cached full transcript."""
+        self.transcription_history.append(result)
+        self._full_text_parts.append(result.text)
+        self._cached_full_text = None
 
     def add_result_callback(self, callback: Callable) -> None:
         """Add callback for transcription results."""
+        if not inspect.iscoroutinefunction(callback):
+            # Run plain functions in a worker thread so they can't block the loop
+            sync_callback = callback
+
+            async def callback(result):
+                outcome = await asyncio.to_thread(sync_callback, result)
+                if inspect.isawaitable(outcome):
+                    # Not async def, but returned a coroutine (e.g. a lambda wrapping one)
+                    outcome = await outcome
+                return outcome
+
         self._result_callbacks.append(callback)
 
     def get_recent_transcriptions(self, count: int = 10) -> List[TranscriptionResult]:
         """Get recent transcription results."""
-        return self.transcription_history[-count:] if self.transcription_history else []
+        start = max(0, len(self.transcription_history) - count)
+        return list(islice(self.transcription_history, start, None))
 
     def get_full_transcript(self) -> str:
         """Get full transcript text."""
-        return " ".join(result.text for result in self.transcription_history)
+        if self._cached_full_text is None:
+            self._cached_full_text = " ".join(self._full_text_parts)
+        return self._cached_full_text
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get aggregated statistics from all clients."""
-        stats = {
+        if self._stats_dirty:
+            self._client_stats = {
+                model_name: client.get_statistics()
+                for model_name, client in self._clients.items()
+            }
+            self._stats_dirty = False
+
+        return {
             'models_used': list(self._clients.keys()),
             'primary_model': self.config.transcription_model,
             'fallback_models': self.config.model_fallback,
-            'client_stats': {},
+            # Copies all the way down, so callers can't alter the cached stats
+            'client_stats': {k: dict(v) for k, v in self._client_stats.items()},
             'transcription_count': len(self.transcription_history),
             'queue_size': self._processing_queue.qsize()
         }
 
-        for model_name, client in self._clients.items():
-            stats['client_stats'][model_name] = client.get_statistics()
-
-        return stats
-
     def get_supported_models(self) -> List[str]:
         """Get list of supported transcription models."""
         return self.registry.get_supported_models()
\ No newline at end of file
@@ -1,23 +1,31 @@
 """Transcription model registry for managing different transcription clients."""
 
-from typing import Dict, Type, List
+from typing import Any, Callable, Dict, Type, List, Optional
 from .base import TranscriptionClient
 
+# Builds a client's config from (model_name, manager_config)
+ConfigFactory = Callable[[str, Any], Any]
+
 
 class TranscriptionRegistry:
     """Registry for transcription client classes."""
     
     def __init__(self):
         self._clients: Dict[str, Type[TranscriptionClient]] = {}
+        self._config_factories: Dict[str, ConfigFactory] = {}
     
-    def register_client(self, model_name: str, client_class: Type[TranscriptionClient]) -> None:
+    def register_client(self, model_name: str, client_class: Type[TranscriptionClient],
+                        config_factory: Optional[ConfigFactory] = None) -> None:
         """Register a transcription client class for a model.
         
         Args:
             model_name: The model identifier (e.g., 'gpt-4o-transcribe', 'whisper-1')
             client_class: The client class that can handle this model
+            config_factory: Optional callable building the client's config
         """
         self._clients[model_name] = client_class
+        if config_factory is not None:
+            self._config_factories[model_name] = config_factory
     
     def get_client_class(self, model_name: str) -> Type[TranscriptionClient]:
         """Get the client class for a model.
@@ -31,9 +39,21 @@ class TranscriptionRegistry:
         Raises:
             KeyError: If the model is not registered
         """
-        if model_name not in self._clients:
-            raise KeyError(f"No client registered for model: {model_name}")
-        return self._clients[model_name]
+        try:
+            return self._clients[model_name]
+        except KeyError:
+            raise KeyError(f"No client registered for model: {model_name}") from None
+    
+    def get_config_factory(self, model_name: str) -> Optional[ConfigFactory]:
+        """Get the config factory registered for a model.
+        
+        Args:
+            model_name: The model identifier
+            
+        Returns:
+            The config factory, or None if the model was registered without one
+        """
+        return self._config_factories.get(model_name)
     
     def get_supported_models(self) -> List[str]:
         """Get list of supported model names.
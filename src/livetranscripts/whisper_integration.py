@@ -1,14 +1,33 @@
 """OpenAI Whisper API integration for audio transcription."""
 
 import asyncio
+import importlib.util
 import io
+import logging
+import random
+import struct
 import time
-import wave
-from dataclasses import dataclass, field
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import Deque, List, Optional, Dict, Any, Callable, Set, Tuple
 import numpy as np
-import openai
+
+try:
+    import httpx  # The HTTP library the openai SDK is built on
+except ImportError:
+    import httpx2 as httpx  # Installed in its place by SDK releases built on httpx2
+
+try:
+    from numba import njit
+except ImportError:  # Optional, installed with the `speedups` extra
+    njit = None
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -21,6 +40,13 @@ class WhisperConfig:
     max_retries: int = 3
     timeout: float = 30.0
     response_format: str = "verbose_json"
+    max_concurrent_batches: int = 4  # Batches transcribed in parallel; results still delivered in order
+    history_max: int = 10000  # Transcription results kept in memory
+    requests_per_minute: Optional[float] = None  # Client-side rate limit; None disables
+    max_coalesce: int = 4  # Queued batches sent as one request; 1 disables coalescing
+    coalesce_max_sec: float = 25.0  # Longest audio a coalesced request may carry
+    coalesce_gap_sec: float = 0.5  # Silence inserted between coalesced batches
+    silence_peak_threshold: int = 200  # Batches peaking below this (int16 scale) skip the API; 0 disables
     
     def __post_init__(self):
         """Validate configuration."""
@@ -30,6 +56,16 @@ class WhisperConfig:
             raise ValueError("Max retries must be non-negative")
         if self.timeout <= 0:
             raise ValueError("Timeout must be positive")
+        if self.max_coalesce < 1:
+            raise ValueError("max_coalesce must be at least 1")
+        if self.max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be at least 1")
+        if self.history_max < 1:
+            raise ValueError("history_max must be at least 1")
+        if self.requests_per_minute is not None and self.requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        if self.silence_peak_threshold < 0:
+            raise ValueError("silence_peak_threshold must be non-negative")
 
 
 @dataclass
@@ -63,20 +99,41 @@ class TranscriptionResult:
     duration: float
     batch_id: int
     timestamp: datetime = field(default_factory=datetime.now)
+    _average_confidence: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _valid: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def average_confidence(self) -> float:
-        """Calculate average confidence across segments."""
-        if not self.segments:
-            return 0.0
-        confidences = [seg.confidence for seg in self.segments if seg.confidence > 0]
-        return sum(confidences) / len(confidences) if confidences else 0.0
+        """Get average confidence across segments, computed once per result."""
+        if self._average_confidence is None:
+            total = 0.0
+            count = 0
+            for seg in self.segments:
+                if seg.confidence > 0:
+                    total += seg.confidence
+                    count += 1
+            self._average_confidence = total / count if count else 0.0
+        return self._average_confidence
     
     def is_valid(self) -> bool:
-        """Check if transcription result is valid."""
-        return (len(self.text.strip()) > 0 and 
-                self.duration > 0 and
-                all(seg.is_valid() for seg in self.segments))
+        """Check if transcription result is valid, validating segments only once."""
+        if self._valid is None:
+            self._valid = (len(self.text.strip()) > 0 and 
+                           self.duration > 0 and
+                           all(seg.is_valid() for seg in self.segments))
+        return self._valid
+    
+    @staticmethod
+    def empty(batch, language: str) -> 'TranscriptionResult':
+        """Build the result for a batch that was skipped as silent."""
+        return TranscriptionResult(
+            text="",
+            segments=[],
+            language=language,
+            duration=batch.duration,
+            batch_id=batch.sequence_id,
+            timestamp=batch.timestamp
+        )
     
     @staticmethod
     def combine(results: List['TranscriptionResult']) -> 'TranscriptionResult':
@@ -89,53 +146,180 @@ class TranscriptionResult:
         time_offset = 0.0
         
         for result in results:
-            for segment in result.segments:
-                adjusted_segment = TranscriptionSegment(
-                    text=segment.text,
-                    start_time=segment.start_time + time_offset,
-                    end_time=segment.end_time + time_offset,
-                    confidence=segment.confidence
+            combined_segments.extend([
+                TranscriptionSegment(
+                    segment.text,
+                    segment.start_time + time_offset,
+                    segment.end_time + time_offset,
+                    segment.confidence
                 )
-                combined_segments.append(adjusted_segment)
+                for segment in result.segments
+            ])
             time_offset += result.duration
         
         return TranscriptionResult(
             text=combined_text,
             segments=combined_segments,
             language=results[0].language,
-            duration=sum(r.duration for r in results),
+            duration=time_offset,
             batch_id=results[0].batch_id,
             timestamp=results[0].timestamp
         )
+    
+    def split(self, batches: List[Any], offsets: List[float]) -> List['TranscriptionResult']:
+        """Split a result for coalesced audio into one result per batch.
+        
+        Each segment goes to the batch its midpoint falls in, with its times
+        shifted back to that batch's start.
+        """
+        per_batch: List[List[TranscriptionSegment]] = [[] for _ in batches]
+        for segment in self.segments:
+            midpoint = (segment.start_time + segment.end_time) / 2
+            index = max(bisect_right(offsets, midpoint) - 1, 0)
+            offset = offsets[index]
+            end_time = min(segment.end_time - offset, batches[index].duration)
+            per_batch[index].append(TranscriptionSegment(
+                segment.text,
+                min(max(segment.start_time - offset, 0.0), end_time),
+                end_time,
+                segment.confidence
+            ))
+        
+        return [
+            TranscriptionResult(
+                text=" ".join(segment.text for segment in segments),
+                segments=segments,
+                language=self.language,
+                duration=batch.duration,
+                batch_id=batch.sequence_id,
+                timestamp=batch.timestamp
+            )
+            for batch, segments in zip(batches, per_batch)
+        ]
+
+
+# Canonical 44-byte header for a PCM WAV file
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+
+@lru_cache(maxsize=None)
+def _smoothing_kernel(window_size: int) -> np.ndarray:
+    """Return the moving-average kernel for a window size (cached, read-only)."""
+    kernel = np.full(window_size, 1.0 / window_size, dtype=np.float32)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _abs_peak(audio_data: np.ndarray) -> float:
+    """Return the largest sample magnitude without an abs() temporary."""
+    # NumPy's SIMD max/min reductions outrun a compiled scalar loop here
+    return max(float(audio_data.max()), -float(audio_data.min()))
+
+
+def _is_silent(audio_data: np.ndarray, threshold: float) -> bool:
+    """Check whether audio peaks below a silence threshold (0 disables the check)."""
+    if threshold <= 0:
+        return False
+    return len(audio_data) == 0 or _abs_peak(audio_data) < threshold
+
+
+def _scale_to_int16_numpy(audio_data: np.ndarray, scale_factor: float) -> np.ndarray:
+    """Scale samples and convert to int16 using NumPy."""
+    # Writing straight into the int16 output skips the full-size float temporary
+    out = np.empty(audio_data.shape, dtype=np.int16)
+    np.multiply(audio_data, scale_factor, out=out, casting='unsafe')
+    return out
+
+
+def _smooth_to_int16_numpy(audio_data: np.ndarray, window_size: int) -> np.ndarray:
+    """Moving-average filter and convert to int16 using NumPy."""
+    filtered = np.convolve(audio_data, _smoothing_kernel(window_size), mode='same')
+    return filtered.astype(np.int16)
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _scale_to_int16(audio_data, scale_factor):
+        """Scale samples and convert to int16 in a single fused pass."""
+        out = np.empty(audio_data.shape[0], dtype=np.int16)
+        for i in range(audio_data.shape[0]):
+            out[i] = np.int16(audio_data[i] * scale_factor)
+        return out
+
+    @njit(cache=True, nogil=True)
+    def _smooth_to_int16(audio_data, window_size):
+        """Moving-average filter and convert to int16 with a sliding window sum."""
+        n = audio_data.shape[0]
+        out = np.empty(n, dtype=np.int16)
+        # Same alignment as np.convolve(..., mode='same')
+        lead = (window_size - 1) // 2
+        scale = 1.0 / window_size
+        total = 0.0
+        for j in range(min(lead, n)):
+            total += audio_data[j]
+        for i in range(n):
+            entering = i + lead
+            if entering < n:
+                total += audio_data[entering]
+            leaving = entering - window_size
+            if leaving >= 0:
+                total -= audio_data[leaving]
+            out[i] = np.int16(total * scale)
+        return out
+else:
+    _scale_to_int16 = _scale_to_int16_numpy
+    _smooth_to_int16 = _smooth_to_int16_numpy
 
 
 class AudioProcessor:
     """Utilities for audio processing before transcription."""
     
+    @staticmethod
+    def audio_to_wav_stream(audio_data: np.ndarray, sample_rate: int = 16000,
+                            name: str = "audio.wav") -> io.BytesIO:
+        """Encode numpy audio as WAV into a rewound, named in-memory file."""
+        # BytesIO shares the immutable bytes buffer rather than copying it
+        wav_buffer = io.BytesIO(AudioProcessor.audio_to_wav_bytes(audio_data, sample_rate))
+        wav_buffer.name = name
+        return wav_buffer
+    
     @staticmethod
     def audio_to_wav_bytes(audio_data: np.ndarray, sample_rate: int = 16000) -> bytes:
         """Convert numpy audio array to WAV bytes."""
-        wav_buffer = io.BytesIO()
-        
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(audio_data.tobytes())
-        
-        return wav_buffer.getvalue()
+        pcm = np.ascontiguousarray(audio_data, dtype='<i2')
+        header = _WAV_HEADER.pack(
+            b'RIFF', 36 + pcm.nbytes, b'WAVE',
+            b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,  # PCM, mono, 16-bit
+            b'data', pcm.nbytes
+        )
+        # Header and samples are copied into the result exactly once
+        return b''.join((header, memoryview(pcm).cast('B')))
     
     @staticmethod
-    def normalize_audio(audio_data: np.ndarray) -> np.ndarray:
-        """Normalize audio to prevent clipping."""
-        if len(audio_data) == 0:
+    def preprocess_to_wav(audio_data: np.ndarray, sample_rate: int = 16000) -> bytes:
+        """Normalize, filter and encode audio as WAV bytes ready for upload."""
+        if len(audio_data) > 0:
+            audio_data = AudioProcessor.normalize_audio(audio_data, return_int16=True)
+            audio_data = AudioProcessor.apply_filters(audio_data, sample_rate)
+        return AudioProcessor.audio_to_wav_bytes(audio_data, sample_rate)
+    
+    @staticmethod
+    def normalize_audio(audio_data: np.ndarray, return_int16: bool = False) -> np.ndarray:
+        """Normalize audio to prevent clipping, optionally quantizing to int16 PCM."""
+        if len(audio_data) == 0 or audio_data.dtype == np.int16:
+            # int16 samples are within range by construction
             return audio_data
         
-        max_val = np.max(np.abs(audio_data))
+        # Peak without allocating an abs() copy
+        max_val = float(_abs_peak(audio_data))
         if max_val > 32767:
             # Scale down to prevent clipping
             scale_factor = 32767 / max_val
-            return (audio_data * scale_factor).astype(np.int16)
+            return _scale_to_int16(audio_data, scale_factor)
+        
+        if return_int16:
+            # Already in range; just quantize
+            return _scale_to_int16(audio_data, 1.0)
         
         return audio_data
     
@@ -149,28 +333,101 @@ class AudioProcessor:
         # Calculate a simple moving average for noise reduction
         window_size = min(5, len(audio_data) // 10)
         if window_size > 1:
-            # Apply simple smoothing
-            filtered = np.convolve(audio_data, np.ones(window_size)/window_size, mode='same')
-            return filtered.astype(np.int16)
+            # Apply simple smoothing (single fused pass with Numba)
+            return _smooth_to_int16(audio_data, window_size)
         
         return audio_data
 
 
+# HTTP/2 needs the optional h2 package (installed with the `speedups` extra)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def create_openai_http_client() -> httpx.AsyncClient:
+    """Create an HTTP client that keeps API connections warm between batches."""
+    # httpx drops idle connections after 5s by default, shorter than the gap
+    # between batches, so every request would otherwise pay a new TLS handshake
+    import openai
+    return openai.DefaultAsyncHttpxClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=8, keepalive_expiry=60.0)
+    )
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Return False for OpenAI errors that retrying cannot fix."""
+    import openai
+    if isinstance(error, openai.APIStatusError):
+        # Only rate limits, timeouts, conflicts and server errors are transient;
+        # other 4xx (bad audio, auth, quota) fail the same way every time
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return True
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Extract a Retry-After delay in seconds from an API error, if present."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        # OpenAI sends a millisecond variant alongside the standard header
+        retry_after_ms = headers.get('retry-after-ms')
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Async token bucket that spaces requests out to stay under a rate limit."""
+    
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate = rate_per_sec
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then take a token."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                # Sleep off the deficit once and take the token it buys, rather than
+                # re-checking the clock and spinning on float leftovers
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 0.0
+                self._updated = time.monotonic()
+            else:
+                self._tokens -= 1
+
+
 class RetryManager:
     """Manages retry logic for API calls."""
     
-    def __init__(self, max_retries: int = 3, base_delay: float = 1.0):
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0,
+                 max_delay: float = 30.0, jitter: float = 0.0):
         self.max_retries = max_retries
         self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
         self.current_attempt = 0
+        self.delay_floor = 0.0  # Minimum delay requested by the server (Retry-After)
     
     def should_retry(self) -> bool:
         """Check if should retry based on current attempt."""
         return self.current_attempt < self.max_retries
     
     def get_delay(self) -> float:
-        """Get delay for current retry (exponential backoff)."""
-        return self.base_delay * (2 ** (self.current_attempt - 1))
+        """Get delay for current retry (capped exponential backoff with jitter)."""
+        delay = self.base_delay * (2 ** (self.current_attempt - 1))
+        if self.jitter:
+            delay *= 1 + random.uniform(0, self.jitter)
+        return max(self.delay_floor, min(self.max_delay, delay))
     
     async def wait(self) -> None:
         """Wait for retry delay."""
@@ -179,11 +436,15 @@ class RetryManager:
             await asyncio.sleep(delay)
     
     @staticmethod
-    def async_retry(max_retries: int = 3, base_delay: float = 1.0):
-        """Decorator for async functions with retry logic."""
+    def async_retry(max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                    jitter: float = 0.5, retry_on: Optional[Callable[[Exception], bool]] = None):
+        """Decorator for async functions with retry logic.
+        
+        Errors for which ``retry_on`` returns False are raised immediately.
+        """
         def decorator(func):
             async def wrapper(*args, **kwargs):
-                retry_manager = RetryManager(max_retries, base_delay)
+                retry_manager = RetryManager(max_retries, base_delay, max_delay, jitter)
                 last_exception = None
                 
                 while retry_manager.should_retry():
@@ -192,7 +453,10 @@ class RetryManager:
                         result = await func(*args, **kwargs)
                         return result
                     except Exception as e:
+                        if retry_on is not None and not retry_on(e):
+                            raise
                         last_exception = e
+                        retry_manager.delay_floor = min(get_retry_after(e) or 0.0, max_delay)
                         retry_manager.current_attempt += 1
                         if not retry_manager.should_retry():
                             break
@@ -202,38 +466,95 @@ class RetryManager:
         return decorator
 
 
-class WhisperClient:
+class RequestStatsMixin:
+    """Success counters and running averages kept in a client's ``_stats`` dict."""
+    
+    __slots__ = ()
+    
+    def _record_success(self, processing_time: float) -> None:
+        """Count a successful request and fold it into the running average."""
+        stats = self._stats
+        stats['successful_requests'] += 1
+        stats['total_processing_time'] += processing_time
+        stats['average_processing_time'] += (
+            processing_time - stats['average_processing_time']
+        ) / stats['successful_requests']
+        self._update_success_rate()
+    
+    def _record_cancelled(self) -> None:
+        """Count a request abandoned before it finished; the success rate excludes it."""
+        self._stats['cancelled_requests'] += 1
+        self._update_success_rate()
+    
+    def _update_success_rate(self) -> None:
+        """Refresh the success rate over the requests that ran to completion."""
+        stats = self._stats
+        finished = stats['total_requests'] - stats['cancelled_requests']
+        stats['success_rate'] = stats['successful_requests'] / finished if finished else 0.0
+
+
+class WhisperClient(RequestStatsMixin):
     """OpenAI Whisper API client for transcription."""
     
     def __init__(self, config: WhisperConfig, api_key: str):
         self.config = config
-        self.client = openai.AsyncOpenAI(api_key=api_key)
+        # Imported here so the SDK's import cost is paid only when a client is built
+        import openai
+        # Retries are handled by RetryManager; SDK retries would multiply them
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key, http_client=create_openai_http_client(), max_retries=0
+        )
+        self._rate_limiter = (
+            TokenBucket(config.requests_per_minute / 60, burst=config.max_concurrent_batches)
+            if config.requests_per_minute else None
+        )
         self._stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cancelled_requests': 0,
             'total_audio_duration': 0.0,
-            'total_processing_time': 0.0
+            'total_processing_time': 0.0,
+            'average_processing_time': 0.0,
+            'success_rate': 0.0
         }
     
     async def transcribe_batch(self, batch) -> TranscriptionResult:
         """Transcribe an audio batch."""
-        from .batching import AudioBatch  # Import here to avoid circular import
+        # Preprocessing and encoding are CPU-bound; keep them off the event loop
+        wav_bytes = await asyncio.to_thread(getattr, batch, "wav_bytes")
+        return await self.transcribe_wav(wav_bytes, batch)
+    
+    async def transcribe_coalesced(self, batches: List[Any], gap_sec: float) -> List[TranscriptionResult]:
+        """Transcribe several batches in one request, separated by silence."""
+        sample_rate = batches[0].sample_rate
+        gap = np.zeros(int(gap_sec * sample_rate), dtype=np.int16)
+        pieces = []
+        offsets = []
+        offset = 0.0
+        for batch in batches:
+            if pieces:
+                pieces.append(gap)
+                offset += gap_sec
+            offsets.append(offset)
+            pieces.append(batch.audio_data)
+            offset += batch.duration
         
+        audio = np.concatenate(pieces)
+        combined = replace(batches[0], audio_data=audio, duration=len(audio) / sample_rate)
+        result = await self.transcribe_batch(combined)
+        return result.split(batches, offsets)
+    
+    async def transcribe_wav(self, wav_bytes: bytes, batch) -> TranscriptionResult:
+        """Transcribe already preprocessed and encoded audio for a batch."""
         start_time = time.time()
         self._stats['total_requests'] += 1
         self._stats['total_audio_duration'] += batch.duration
         
         try:
-            # Preprocess audio
-            processed_audio = self._preprocess_audio(batch.audio_data)
-            
-            # Convert to WAV bytes
-            wav_bytes = AudioProcessor.audio_to_wav_bytes(processed_audio)
-            
-            # Create file-like object
-            audio_file = io.BytesIO(wav_bytes)
-            audio_file.name = f"batch_{batch.sequence_id}.wav"
+            # The SDK sends bytes straight into the multipart body, with no file
+            # object to read through in chunks, and can resend them on retry
+            audio_file = (f"batch_{batch.sequence_id}.wav", wav_bytes, "audio/wav")
             
             # Prepare request parameters
             params = self._format_request_parameters()
@@ -244,28 +565,19 @@ class WhisperClient:
             # Process response
             result = self._process_response(response, batch)
             
-            self._stats['successful_requests'] += 1
-            self._stats['total_processing_time'] += time.time() - start_time
+            self._record_success(time.time() - start_time)
             
             return result
             
+        except asyncio.CancelledError:
+            # Abandoned before finishing, e.g. the losing side of a hedged race
+            self._record_cancelled()
+            raise
         except Exception as e:
             self._stats['failed_requests'] += 1
+            self._update_success_rate()
             raise e
     
-    def _preprocess_audio(self, audio_data: np.ndarray) -> np.ndarray:
-        """Preprocess audio before transcription."""
-        if len(audio_data) == 0:
-            return audio_data
-        
-        # Normalize to prevent clipping
-        processed = AudioProcessor.normalize_audio(audio_data)
-        
-        # Apply basic filters
-        processed = AudioProcessor.apply_filters(processed)
-        
-        return processed
-    
     def _format_request_parameters(self) -> Dict[str, Any]:
         """Format parameters for Whisper API request."""
         params = {
@@ -279,9 +591,11 @@ class WhisperClient:
         
         return params
     
-    @RetryManager.async_retry(max_retries=3, base_delay=1.0)
-    async def _make_transcription_request(self, audio_file: io.BytesIO, params: Dict[str, Any]):
+    @RetryManager.async_retry(max_retries=3, base_delay=1.0, retry_on=is_retryable_error)
+    async def _make_transcription_request(self, audio_file: Tuple[str, bytes, str], params: Dict[str, Any]):
         """Make the actual transcription request with retry."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
         return await self.client.audio.transcriptions.create(
             file=audio_file,
             **params
@@ -318,42 +632,60 @@ class WhisperClient:
             timestamp=batch.timestamp
         )
     
+    async def close(self) -> None:
+        """Release the client's HTTP connection pool."""
+        await self.client.close()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get transcription statistics."""
-        stats = self._stats.copy()
-        
-        if stats['successful_requests'] > 0:
-            stats['average_processing_time'] = (
-                stats['total_processing_time'] / stats['successful_requests']
-            )
-            stats['success_rate'] = (
-                stats['successful_requests'] / stats['total_requests']
-            )
-        else:
-            stats['average_processing_time'] = 0.0
-            stats['success_rate'] = 0.0
-        
-        return stats
+        return self._stats.copy()
 
 
-class TranscriptionManager:
-    """Manages the transcription pipeline."""
+# Queued by stop_processing to wake the processing loop, which exits on it
+# unless processing was restarted in the meantime
+_SENTINEL = object()
+
+
+class OrderedDispatchMixin(ABC):
+    """Transcribe queued batches concurrently and deliver results in queue order.
     
-    def __init__(self, whisper_client: WhisperClient):
-        self.whisper_client = whisper_client
-        self.transcription_history: List[TranscriptionResult] = []
+    Subclasses call ``_init_dispatch`` from ``__init__`` and implement
+    ``_transcribe_work`` and ``_deliver_result``. ``_next_batch`` and
+    ``_take_work`` may be overridden to group a dequeued batch with others
+    already waiting.
+    """
+    
+    def _init_dispatch(self, max_in_flight: int) -> None:
+        """Set up the queue, the concurrency limit and the reorder buffer."""
         self.is_processing = False
         self._processing_queue = asyncio.Queue()
-        self._result_callbacks = []
+        self._processing_task: Optional[asyncio.Task] = None
+        self._inflight_sem = asyncio.Semaphore(max_in_flight or 4)
+        self._batch_tasks: Set[asyncio.Task] = set()
+        # Finished results wait here until every earlier ticket has been delivered
+        self._completed: Dict[int, Any] = {}
+        self._next_dispatch = 0
+        self._next_delivery = 0
+        self._delivery_lock = asyncio.Lock()
     
     async def start_processing(self) -> None:
         """Start the transcription processing pipeline."""
         self.is_processing = True
-        asyncio.create_task(self._process_queue())
+        # A loop that has not reached its stop sentinel yet simply keeps running
+        if self._processing_task is None or self._processing_task.done():
+            self._processing_task = asyncio.create_task(self._process_queue())
     
     async def stop_processing(self) -> None:
-        """Stop the transcription processing pipeline."""
+        """Stop the transcription processing pipeline.
+        
+        Returns once everything queued before the stop has been transcribed
+        and delivered, so no result arrives after this and clients can be closed.
+        """
         self.is_processing = False
+        await self._processing_queue.put(_SENTINEL)
+        if self._processing_task is not None:
+            await asyncio.gather(self._processing_task, return_exceptions=True)
+        await asyncio.gather(*self._batch_tasks, return_exceptions=True)
     
     async def transcribe_batch(self, batch) -> None:
         """Queue a batch for transcription."""
@@ -361,33 +693,166 @@ class TranscriptionManager:
             await self._processing_queue.put(batch)
     
     async def _process_queue(self) -> None:
-        """Process batches from the queue."""
-        while self.is_processing:
+        """Dispatch queued batches, keeping up to max_concurrent_batches in flight."""
+        while True:
+            batch = await self._next_batch()
+            if batch is _SENTINEL:
+                if self.is_processing:
+                    # Stale: processing was restarted after this stop was queued
+                    continue
+                break
+            
+            # Wait for a free slot before taking on more work
+            await self._inflight_sem.acquire()
             try:
-                # Wait for batch with timeout
-                batch = await asyncio.wait_for(
-                    self._processing_queue.get(), 
-                    timeout=1.0
-                )
-                
-                # Transcribe batch
-                result = await self.whisper_client.transcribe_batch(batch)
-                
-                # Store result
-                self.transcription_history.append(result)
-                
-                # Notify callbacks
-                for callback in self._result_callbacks:
-                    try:
-                        await callback(result)
-                    except Exception as e:
-                        print(f"Callback error: {e}")
-                
-            except asyncio.TimeoutError:
-                # No batch available, continue
+                work = self._take_work(batch)
+            except BaseException:
+                self._inflight_sem.release()
+                raise
+            ticket = self._next_dispatch
+            self._next_dispatch += 1
+            task = asyncio.create_task(self._handle_batch(ticket, work))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _next_batch(self) -> Any:
+        """Wait for the next queued batch (or stop sentinel)."""
+        return await self._processing_queue.get()
+    
+    def _take_work(self, batch) -> Any:
+        """Return the unit of work to transcribe for a dequeued batch."""
+        return batch
+    
+    @abstractmethod
+    async def _transcribe_work(self, work) -> Any:
+        """Transcribe one unit of work; None or an exception marks it failed."""
+        pass
+    
+    @abstractmethod
+    async def _deliver_result(self, result) -> None:
+        """Record a finished result and notify callbacks."""
+        pass
+    
+    async def _handle_batch(self, ticket: int, work) -> None:
+        """Transcribe one unit of work and deliver any results that are now in order."""
+        result = None
+        try:
+            result = await self._transcribe_work(work)
+        except Exception as e:
+            logger.error("Transcription error: %s", e)
+        finally:
+            self._inflight_sem.release()
+        
+        self._completed[ticket] = result
+        await self._deliver_in_order()
+    
+    async def _deliver_in_order(self) -> None:
+        """Deliver finished results in the order their batches were queued."""
+        async with self._delivery_lock:
+            while self._next_delivery in self._completed:
+                result = self._completed.pop(self._next_delivery)
+                self._next_delivery += 1
+                if result is None:
+                    # Failed work; don't hold up the tickets behind it
+                    continue
+                await self._deliver_result(result)
+
+
+class TranscriptionManager(OrderedDispatchMixin):
+    """Manages the transcription pipeline."""
+    
+    def __init__(self, whisper_client: WhisperClient):
+        self.whisper_client = whisper_client
+        self.transcription_history: Deque[TranscriptionResult] = deque(
+            maxlen=whisper_client.config.history_max
+        )
+        # Running totals cover every result, including ones aged out of the history
+        self._result_count = 0
+        self._total_duration = 0.0
+        self._confidence_sum = 0.0
+        self._full_text_parts: List[str] = []
+        self._cached_full_text: Optional[str] = None
+        self._result_callbacks = []
+        self._init_dispatch(whisper_client.config.max_concurrent_batches)
+        # Only verbose_json carries the segment timings needed to split a coalesced result
+        self._coalesce = (
+            whisper_client.config.max_coalesce > 1
+            and whisper_client.config.response_format == "verbose_json"
+        )
+        self._held_batch = None
+    
+    async def _next_batch(self) -> Any:
+        """Take the batch held back by coalescing before reading the queue."""
+        if self._held_batch is not None:
+            batch, self._held_batch = self._held_batch, None
+            return batch
+        return await super()._next_batch()
+    
+    def _take_work(self, batch) -> List[Any]:
+        """Send a batch alone, or with the batches queued behind it when coalescing."""
+        return self._coalesce_queued(batch) if self._coalesce else [batch]
+    
+    def _coalesce_queued(self, batch) -> List[Any]:
+        """Group already queued batches behind this one into a single request."""
+        config = self.whisper_client.config
+        batches = [batch]
+        total = batch.duration
+        # Only take what is already waiting, so coalescing never adds latency
+        while len(batches) < config.max_coalesce and not self._processing_queue.empty():
+            queued = self._processing_queue.get_nowait()
+            if queued is _SENTINEL:
+                # Leave the stop request for the processing loop to see next
+                self._held_batch = queued
+                break
+            total += config.coalesce_gap_sec + queued.duration
+            if total > config.coalesce_max_sec:
+                self._held_batch = queued
+                break
+            batches.append(queued)
+        return batches
+    
+    async def _transcribe_work(self, batches: List[Any]) -> List[TranscriptionResult]:
+        """Transcribe one request's batches, returning a result per batch."""
+        config = self.whisper_client.config
+        # Silent batches get empty results; don't pay for an upload and API round trip
+        silent = [_is_silent(batch.audio_data, config.silence_peak_threshold) for batch in batches]
+        speech = [batch for batch, is_silent in zip(batches, silent) if not is_silent]
+        
+        transcribed = iter(await self._transcribe_speech(speech) if speech else ())
+        language = config.language or 'unknown'
+        return [
+            TranscriptionResult.empty(batch, language) if is_silent else next(transcribed)
+            for batch, is_silent in zip(batches, silent)
+        ]
+    
+    async def _transcribe_speech(self, batches: List[Any]) -> List[TranscriptionResult]:
+        """Send batches with speech in them as one request."""
+        if len(batches) == 1:
+            return [await self.whisper_client.transcribe_batch(batches[0])]
+        return await self.whisper_client.transcribe_coalesced(
+            batches, self.whisper_client.config.coalesce_gap_sec
+        )
+    
+    async def _deliver_result(self, results: List[TranscriptionResult]) -> None:
+        """Store one request's results and notify callbacks for each."""
+        for result in results:
+            if not result.text:
+                # Skipped as silent or no speech heard; nothing to record or announce
                 continue
-            except Exception as e:
-                print(f"Transcription error: {e}")
+            # Store result and invalidate the cached full transcript
+            self.transcription_history.append(result)
+            self._result_count += 1
+            self._total_duration += result.duration
+            self._confidence_sum += result.average_confidence
+            self._full_text_parts.append(result.text)
+            self._cached_full_text = None
+            
+            # Notify callbacks
+            for callback in self._result_callbacks:
+                try:
+                    await callback(result)
+                except Exception as e:
+                    logger.error("Callback error: %s", e)
     
     def add_result_callback(self, callback) -> None:
         """Add callback for transcription results."""
@@ -395,25 +860,26 @@ class TranscriptionManager:
     
     def get_recent_transcriptions(self, count: int = 10) -> List[TranscriptionResult]:
         """Get recent transcription results."""
-        return self.transcription_history[-count:] if self.transcription_history else []
+        start = max(0, len(self.transcription_history) - count)
+        return list(islice(self.transcription_history, start, None))
     
     def get_full_transcript(self) -> str:
         """Get full transcript text."""
-        return " ".join(result.text for result in self.transcription_history)
+        if self._cached_full_text is None:
+            self._cached_full_text = " ".join(self._full_text_parts)
+        return self._cached_full_text
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get transcription statistics."""
         base_stats = self.whisper_client.get_statistics()
         
-        total_duration = sum(r.duration for r in self.transcription_history)
         avg_confidence = (
-            sum(r.average_confidence for r in self.transcription_history) / 
-            len(self.transcription_history)
-        ) if self.transcription_history else 0.0
+            self._confidence_sum / self._result_count
+        ) if self._result_count else 0.0
         
         base_stats.update({
-            'total_transcribed_duration': total_duration,
-            'transcription_count': len(self.transcription_history),
+            'total_transcribed_duration': self._total_duration,
+            'transcription_count': self._result_count,
             'average_confidence': avg_confidence,
             'queue_size': self._processing_queue.qsize()
         })
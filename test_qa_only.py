@@ -29,28 +29,46 @@ async def test_qa_client():
                 "Can you explain voice activity detection?"
             ]
             
-            for i, question in enumerate(test_questions, 1):
+            # Answers arrive in whatever order the server finishes them,
+            # so route each one to its question by request_id
+            loop = asyncio.get_running_loop()
+            pending = {}
+            
+            async def reader():
+                async for message in websocket:
+                    response_data = json.loads(message)
+                    future = pending.pop(response_data.get("request_id"), None)
+                    if future is not None and not future.done():
+                        future.set_result(response_data)
+            
+            async def ask(question, i):
+                request_id = f"test_{i}"
+                pending[request_id] = loop.create_future()
                 print(f"\n❓ Question {i}: {question}")
                 
                 # Send question
                 request = {
                     "type": "question",
                     "question": question,
-                    "request_id": f"test_{i}"
+                    "request_id": request_id
                 }
                 await websocket.send(json.dumps(request))
-                
-                # Get response
-                response = await websocket.recv()
-                response_data = json.loads(response)
-                
+                return i, await asyncio.wait_for(pending[request_id], timeout=60)
+            
+            reader_task = asyncio.create_task(reader())
+            try:
+                responses = await asyncio.gather(
+                    *[ask(question, i) for i, question in enumerate(test_questions, 1)]
+                )
+            finally:
+                reader_task.cancel()
+            
+            for i, response_data in responses:
                 if response_data["type"] == "answer":
-                    print(f"💬 Answer: {response_data['answer'][:100]}...")
+                    print(f"💬 Answer {i}: {response_data['answer'][:100]}...")
                     print(f"⏱️  Processing time: {response_data['processing_time']:.2f}s")
                 else:
-                    print(f"❌ Error: {response_data}")
-                
-                await asyncio.sleep(1)  # Be nice to the API
+                    print(f"❌ Error {i}: {response_data}")
                 
     except Exception as e:
         print(f"❌ Connection failed: {e}")
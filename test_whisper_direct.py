@@ -35,17 +35,15 @@ async def test_whisper_with_audio():
         samples = int(duration * sample_rate)
         
         # Generate a mix of tones that might resemble speech patterns
-        t = np.linspace(0, duration, samples)
+        t = np.arange(samples, dtype=np.float32) / sample_rate
         
-        # Create speech-like audio with multiple frequencies
-        audio = np.zeros(samples)
-        freqs = [200, 400, 800, 1200]  # Speech-like frequencies
-        for freq in freqs:
-            audio += 0.25 * np.sin(2 * np.pi * freq * t)
+        # Create speech-like audio with multiple frequencies, one row per tone
+        freqs = np.asarray([200, 400, 800, 1200], dtype=np.float32)  # Speech-like frequencies
+        phases = (2 * np.pi * freqs)[:, None] * t[None, :]
+        audio = 0.25 * np.sin(phases, out=phases).sum(axis=0)
         
         # Add some noise and variation
-        noise = np.random.normal(0, 0.1, samples)
-        audio += noise
+        audio += np.random.default_rng().standard_normal(samples, dtype=np.float32) * 0.1
         
         # Convert to int16
         audio_int16 = (audio * 16384).astype(np.int16)
@@ -71,15 +69,20 @@ async def test_whisper_with_audio():
         print(f"🎯 Confidence: {result.average_confidence:.2f}")
         print(f"📊 Segments: {len(result.segments)}")
         
-        for i, segment in enumerate(result.segments):
-            print(f"   Segment {i+1}: '{segment.text}' ({segment.start_time:.1f}s-{segment.end_time:.1f}s)")
+        if result.segments:
+            print("\n".join(
+                f"   Segment {i}: '{segment.text}' ({segment.start_time:.1f}s-{segment.end_time:.1f}s)"
+                for i, segment in enumerate(result.segments, 1)
+            ))
         
         # Test client statistics
         stats = client.get_statistics()
-        print(f"\\n📈 Client Stats:")
-        print(f"   Total requests: {stats['total_requests']}")
-        print(f"   Success rate: {stats['success_rate']:.1%}")
-        print(f"   Avg processing time: {stats['average_processing_time']:.2f}s")
+        print(
+            f"\n📈 Client Stats:\n"
+            f"   Total requests: {stats['total_requests']}\n"
+            f"   Success rate: {stats['success_rate']:.1%}\n"
+            f"   Avg processing time: {stats['average_processing_time']:.2f}s"
+        )
         
     except Exception as e:
         print(f"❌ Error: {e}")
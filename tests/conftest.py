@@ -3,12 +3,20 @@
 import pytest
 import asyncio
 import numpy as np
-from datetime import datetime
-from unittest.mock import Mock, AsyncMock
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import AsyncMock
 
 from src.livetranscripts.batching import AudioBatch, BatchingConfig
 from src.livetranscripts.whisper_integration import TranscriptionResult, TranscriptionSegment
 from src.livetranscripts.gemini_integration import GeminiConfig, ContextManager
+from src.livetranscripts.live_qa import _json_loads
+
+
+# Fixture data uses a fixed clock so runs are deterministic and comparable
+_FIXED_TS = datetime(2024, 1, 1, 12, 0, 0)
 
 
 @pytest.fixture(scope="session")
@@ -19,9 +27,24 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
+def sent_messages(mock_websocket):
+    """Decode every message sent on a mock websocket, unwrapping batch frames."""
+    messages = []
+    for call in mock_websocket.send.call_args_list:
+        frame = _json_loads(call[0][0])
+        messages.extend(frame["items"] if frame.get("type") == "batch" else [frame])
+    return messages
+
+
+def _read_only(audio):
+    """Freeze a session-scoped array so no test can change it for the others."""
+    audio.setflags(write=False)
+    return audio
+
+
+@pytest.fixture(scope="session")
 def sample_audio_data():
-    """Generate sample audio data for testing."""
+    """Generate sample audio data for testing, once per session."""
     # Generate 1 second of 16kHz audio (speech-like pattern)
     duration = 1.0
     sample_rate = 16000
@@ -31,10 +54,10 @@ def sample_audio_data():
     t = np.linspace(0, duration, samples)
     frequency = 440  # A4 note
     signal = np.sin(2 * np.pi * frequency * t)
-    noise = np.random.normal(0, 0.1, samples)
+    noise = np.random.default_rng(0).normal(0, 0.1, samples)
     audio = ((signal + noise) * 16384).astype(np.int16)
     
-    return audio
+    return _read_only(audio)
 
 
 @pytest.fixture
@@ -42,7 +65,7 @@ def sample_audio_batch(sample_audio_data):
     """Create a sample audio batch for testing."""
     return AudioBatch(
         audio_data=sample_audio_data,
-        timestamp=datetime.now(),
+        timestamp=_FIXED_TS,
         duration=1.0,
         sequence_id=1
     )
@@ -63,11 +86,11 @@ def sample_transcription_result():
         language="en",
         duration=4.0,
         batch_id=1,
-        timestamp=datetime.now()
+        timestamp=_FIXED_TS
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def batching_config():
     """Create a standard batching configuration for testing."""
     return BatchingConfig(
@@ -79,7 +102,7 @@ def batching_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gemini_config():
     """Create a standard Gemini configuration for testing."""
     return GeminiConfig(
@@ -97,81 +120,106 @@ def context_manager(gemini_config):
     return ContextManager(gemini_config)
 
 
+@dataclass(frozen=True)
+class _FakeSegment:
+    """Plain stand-in for an API transcription segment."""
+    
+    text: str
+    start: float
+    end: float
+
+
+@dataclass(frozen=True)
+class _FakeResponse:
+    """Plain stand-in for an API response."""
+    
+    text: str
+    segments: List[_FakeSegment] = field(default_factory=list)
+    language: str = "en"
+
+
+def _returns(value):
+    """Build an async function that always returns value."""
+    async def call(*args, **kwargs):
+        return value
+    return call
+
+
 @pytest.fixture
 def mock_openai_client():
-    """Create a mock OpenAI client for Whisper API testing."""
-    mock_client = Mock()
-    mock_response = Mock()
-    mock_response.text = "Mock transcription result"
-    mock_response.segments = [
-        Mock(text="Mock", start=0.0, end=1.0),
-        Mock(text="transcription", start=1.0, end=2.5),
-        Mock(text="result", start=2.5, end=3.0)
-    ]
-    mock_response.language = "en"
+    """Create a stub OpenAI client for Whisper API testing.
     
-    mock_client.audio.transcriptions.create = AsyncMock(return_value=mock_response)
-    return mock_client
+    Tests that assert on calls should use their own Mock-based client.
+    """
+    response = _FakeResponse(
+        text="Mock transcription result",
+        segments=[
+            _FakeSegment("Mock", 0.0, 1.0),
+            _FakeSegment("transcription", 1.0, 2.5),
+            _FakeSegment("result", 2.5, 3.0)
+        ]
+    )
+    return SimpleNamespace(
+        audio=SimpleNamespace(transcriptions=SimpleNamespace(create=_returns(response)))
+    )
 
 
 @pytest.fixture
 def mock_gemini_client():
-    """Create a mock Gemini client for testing."""
-    mock_client = Mock()
-    mock_response = Mock()
-    mock_response.text = "Mock Gemini response"
-    mock_client.generate_content_async = AsyncMock(return_value=mock_response)
-    return mock_client
+    """Create a stub Gemini client for testing."""
+    return SimpleNamespace(
+        generate_content_async=_returns(_FakeResponse(text="Mock Gemini response"))
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def silence_audio():
-    """Generate silence audio for testing."""
+    """Generate silence audio for testing, once per session."""
     duration = 1.0
     sample_rate = 16000
     samples = int(duration * sample_rate)
     # Very quiet audio (background noise level)
-    return np.random.randint(-50, 50, samples, dtype=np.int16)
+    return _read_only(np.random.default_rng(0).integers(-50, 50, samples, dtype=np.int16))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def speech_audio():
-    """Generate speech-like audio for testing."""
+    """Generate speech-like audio for testing, once per session."""
     duration = 1.0
     sample_rate = 16000
     samples = int(duration * sample_rate)
     # Louder audio simulating speech
-    return np.random.randint(-12000, 12000, samples, dtype=np.int16)
+    return _read_only(np.random.default_rng(0).integers(-12000, 12000, samples, dtype=np.int16))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def meeting_transcripts():
     """Create a series of meeting transcripts for testing."""
     return [
         TranscriptionResult(
             "Good morning everyone, let's start today's meeting",
             [TranscriptionSegment("Good morning everyone, let's start today's meeting", 0.0, 3.0, 0.92)],
-            "en", 3.0, 1, datetime.now()
+            "en", 3.0, 1, _FIXED_TS
         ),
         TranscriptionResult(
             "First agenda item is the quarterly budget review",
             [TranscriptionSegment("First agenda item is the quarterly budget review", 0.0, 3.5, 0.88)],
-            "en", 3.5, 2, datetime.now()
+            "en", 3.5, 2, _FIXED_TS + timedelta(seconds=3)
         ),
         TranscriptionResult(
             "We've exceeded our targets by fifteen percent this quarter",
             [TranscriptionSegment("We've exceeded our targets by fifteen percent this quarter", 0.0, 4.0, 0.95)],
-            "en", 4.0, 3, datetime.now()
+            "en", 4.0, 3, _FIXED_TS + timedelta(seconds=6.5)
         ),
         TranscriptionResult(
             "John will prepare the detailed analysis by Friday",
             [TranscriptionSegment("John will prepare the detailed analysis by Friday", 0.0, 3.2, 0.90)],
-            "en", 3.2, 4, datetime.now()
+            "en", 3.2, 4, _FIXED_TS + timedelta(seconds=10.5)
         ),
         TranscriptionResult(
             "Any questions before we move to the next item?",
             [TranscriptionSegment("Any questions before we move to the next item?", 0.0, 2.8, 0.87)],
-            "en", 2.8, 5, datetime.now()
+            "en", 2.8, 5, _FIXED_TS + timedelta(seconds=13.7)
         )
     ]
 
@@ -198,18 +246,24 @@ class AsyncTestHelper:
     
     @staticmethod
     async def run_with_timeout(coro, timeout=5.0):
-        """Run coroutine with timeout."""
+        """Run coroutine with timeout, or directly when timeout is None."""
+        if timeout is None:
+            return await coro
         return await asyncio.wait_for(coro, timeout=timeout)
     
     @staticmethod
     async def collect_async_results(async_generator, max_items=10):
-        """Collect results from async generator."""
-        results = []
+        """Collect up to max_items results from async generator."""
+        if max_items <= 0:
+            return []
+        results = [None] * max_items
+        count = 0
         async for item in async_generator:
-            results.append(item)
-            if len(results) >= max_items:
+            results[count] = item
+            count += 1
+            if count == max_items:
                 break
-        return results
+        return results[:count]
 
 
 @pytest.fixture
@@ -219,9 +273,9 @@ def async_helper():
 
 
 # Mock environment variables for testing
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def mock_env_vars(monkeypatch):
-    """Mock environment variables for all tests."""
+    """Mock environment variables, and restore them afterwards, for tests that change them."""
     monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
     monkeypatch.setenv("GOOGLE_API_KEY", "test_google_key")
     monkeypatch.setenv("TESTING", "true")
@@ -235,21 +289,27 @@ class AudioTestUtils:
     def generate_tone(frequency, duration, sample_rate=16000, amplitude=0.5):
         """Generate a pure tone for testing."""
         samples = int(duration * sample_rate)
-        t = np.linspace(0, duration, samples)
-        tone = amplitude * np.sin(2 * np.pi * frequency * t)
-        return (tone * 32767).astype(np.int16)
+        phase = np.arange(samples, dtype=np.float32) * np.float32(2 * np.pi * frequency / sample_rate)
+        tone = np.sin(phase, out=phase)
+        tone *= np.float32(amplitude * 32767)
+        return tone.astype(np.int16)
     
     @staticmethod
-    def add_noise(audio, noise_level=0.1):
+    def add_noise(audio, noise_level=0.1, rng=None):
         """Add noise to audio signal."""
-        noise = np.random.normal(0, noise_level, len(audio))
-        noisy = audio + (noise * 32767).astype(np.int16)
-        return np.clip(noisy, -32768, 32767).astype(np.int16)
+        rng = rng if rng is not None else np.random.default_rng()
+        # Sum in float32 so loud samples clip instead of wrapping around int16
+        noisy = rng.standard_normal(audio.shape, dtype=np.float32)
+        noisy *= np.float32(noise_level * 32767)
+        noisy += audio
+        return np.clip(noisy, -32768, 32767, out=noisy).astype(np.int16)
     
     @staticmethod
     def calculate_rms(audio):
         """Calculate RMS energy of audio signal."""
-        return np.sqrt(np.mean(audio.astype(np.float64) ** 2))
+        # int16 squares sum exactly in int64, with no squared temporary
+        samples = audio.astype(np.int64)
+        return np.sqrt(np.dot(samples, samples) / len(samples))
 
 
 @pytest.fixture
@@ -6,7 +6,13 @@ import json
 from unittest.mock import Mock, AsyncMock, patch
 import websockets
 
-from src.livetranscripts.live_qa import MessageType, WebSocketHandler
+from src.livetranscripts.live_qa import MessageType, WebSocketHandler, _json_loads
+from tests.conftest import sent_messages
+
+
+def _last_sent(mock_websocket):
+    """Decode the last message sent on a mock websocket with the server's codec."""
+    return _json_loads(mock_websocket.send.call_args[0][0])
 
 
 class TestAPIKeyWebSocketProtocol:
@@ -36,12 +42,13 @@ class TestAPIKeyWebSocketProtocol:
         qa_handler = Mock()
         server = Mock()
         server.api_key_manager = mock_api_key_manager
+        server.broadcast_message = AsyncMock()
         
         handler = WebSocketHandler(session_manager, qa_handler, server)
         handler.current_session_id = "test_session"
         return handler
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_get_api_keys_message(self, websocket_handler, mock_websocket, mock_api_key_manager):
         """Test handling GET_API_KEYS message."""
         # Mock the manager to return masked keys
@@ -63,13 +70,13 @@ class TestAPIKeyWebSocketProtocol:
         
         # Should send response
         mock_websocket.send.assert_called_once()
-        sent_data = json.loads(mock_websocket.send.call_args[0][0])
+        sent_data = _last_sent(mock_websocket)
         
         assert sent_data["type"] == "api_keys"
         assert sent_data["openai_key"] == "sk-...vwxyz"
         assert sent_data["gemini_key"] == "AIza...nopqr"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_set_api_keys_valid(self, websocket_handler, mock_websocket, mock_api_key_manager):
         """Test handling SET_API_KEYS message with valid keys."""
         # Send SET_API_KEYS message
@@ -93,13 +100,49 @@ class TestAPIKeyWebSocketProtocol:
         
         # Should send success response
         mock_websocket.send.assert_called()
-        sent_data = json.loads(mock_websocket.send.call_args[0][0])
+        sent_data = _last_sent(mock_websocket)
         
         assert sent_data["type"] == "api_keys_updated"
         assert sent_data["success"] is True
         assert "API keys updated successfully" in sent_data["message"]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
+    async def test_set_api_keys_broadcasts_status_to_all_clients(self, websocket_handler, mock_websocket):
+        """Test that a key update tells every connected client the new key status."""
+        message = {
+            "type": "set_api_keys",
+            "openai_key": "sk-new1234567890abcdefghijklmnopqrstuvwxyz",
+            "gemini_key": ""
+        }
+        websocket_handler.server.api_key_manager.get_api_keys.return_value = {
+            'openai_key': 'sk-...vwxyz',
+            'gemini_key': ''
+        }
+        
+        await websocket_handler._process_message(mock_websocket, json.dumps(message))
+        
+        websocket_handler.server.broadcast_message.assert_awaited_once()
+        status = websocket_handler.server.broadcast_message.call_args[0][0]
+        assert status["type"] == "api_keys_status"
+        assert status["has_openai_key"] is True
+        assert status["has_gemini_key"] is False
+
+    @pytest.mark.asyncio(loop_scope="class")
+    async def test_failed_status_broadcast_does_not_report_failure(self, websocket_handler, mock_websocket):
+        """Test that saved keys get only a success reply even if the broadcast fails."""
+        websocket_handler.server.broadcast_message.side_effect = RuntimeError("broadcast failed")
+        message = {
+            "type": "set_api_keys",
+            "openai_key": "sk-new1234567890abcdefghijklmnopqrstuvwxyz",
+            "gemini_key": ""
+        }
+        
+        await websocket_handler._process_message(mock_websocket, json.dumps(message))
+        
+        replies = [m for m in sent_messages(mock_websocket) if m["type"] != "api_keys_status"]
+        assert [(m["type"], m.get("success")) for m in replies] == [("api_keys_updated", True)]
+
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_set_api_keys_invalid(self, websocket_handler, mock_websocket, mock_api_key_manager):
         """Test handling SET_API_KEYS message with invalid keys."""
         from src.livetranscripts.api_key_manager import APIKeyValidationError
@@ -119,13 +162,13 @@ class TestAPIKeyWebSocketProtocol:
         
         # Should send error response
         mock_websocket.send.assert_called()
-        sent_data = json.loads(mock_websocket.send.call_args[0][0])
+        sent_data = _last_sent(mock_websocket)
         
         assert sent_data["type"] == "api_keys_updated"
         assert sent_data["success"] is False
         assert "Invalid OpenAI API key format" in sent_data["message"]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_set_partial_api_keys(self, websocket_handler, mock_websocket, mock_api_key_manager):
         """Test setting only one API key."""
         # Send message with only OpenAI key
@@ -144,7 +187,7 @@ class TestAPIKeyWebSocketProtocol:
             gemini_key=""
         )
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_clear_api_keys(self, websocket_handler, mock_websocket, mock_api_key_manager):
         """Test clearing API keys."""
         # Send message with empty keys
@@ -166,7 +209,7 @@ class TestAPIKeyWebSocketProtocol:
         # Should still reload environment
         mock_api_key_manager.reload_environment.assert_called_once()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_api_keys_on_connection(self, mock_websocket, mock_api_key_manager):
         """Test that API keys status is sent on connection."""
         # Create handler
@@ -191,15 +234,17 @@ class TestAPIKeyWebSocketProtocol:
         await handler.handle_connection(mock_websocket)
         
         # Should have sent API keys status
-        sent_messages = [json.loads(call[0][0]) for call in mock_websocket.send.call_args_list]
+        messages = sent_messages(mock_websocket)
         
         # Find API keys message
-        api_keys_msg = next((msg for msg in sent_messages if msg.get("type") == "api_keys_status"), None)
+        api_keys_msg = next((msg for msg in messages if msg.get("type") == "api_keys_status"), None)
         assert api_keys_msg is not None
+        # The whole greeting goes out as a single frame
+        mock_websocket.send.assert_called_once()
         assert api_keys_msg["has_openai_key"] is True
         assert api_keys_msg["has_gemini_key"] is True
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_unauthorized_api_key_access(self, websocket_handler, mock_websocket):
         """Test that non-admin users cannot access API key functions."""
         # For MVP, we'll allow all users. In production, add admin check here.
@@ -214,7 +259,7 @@ class TestAPIKeyWebSocketProtocol:
         
         # Should have sent response (not error)
         mock_websocket.send.assert_called()
-        sent_data = json.loads(mock_websocket.send.call_args[0][0])
+        sent_data = _last_sent(mock_websocket)
         assert sent_data["type"] == "api_keys"
 
     def test_message_type_enum_includes_api_keys(self):
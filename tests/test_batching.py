@@ -43,6 +43,16 @@ class TestAudioBatch:
         expected_size = 1000 * 2  # 1000 samples * 2 bytes per int16
         assert batch.size_bytes == expected_size
 
+    def test_wav_bytes_are_encoded_once(self):
+        """Test that the preprocessed WAV encoding is cached on the batch."""
+        audio_data = np.random.randint(-32768, 32767, 1600, dtype=np.int16)
+        batch = AudioBatch(audio_data=audio_data, timestamp=datetime.now())
+        
+        wav_bytes = batch.wav_bytes
+        
+        assert wav_bytes[:4] == b"RIFF"
+        assert batch.wav_bytes is wav_bytes
+
     def test_batch_validation(self):
         """Test batch data validation."""
         # Valid batch
@@ -159,6 +169,38 @@ class TestSilenceDetector:
         assert energy_high > silence_detector.energy_threshold
         assert energy_low < silence_detector.energy_threshold
 
+    def test_threshold_check_matches_rms(self, silence_detector):
+        """Test that the squared threshold check agrees with RMS on both sides."""
+        threshold = silence_detector.energy_threshold
+        for level in (0, threshold - 1, threshold + 1, 20000):
+            audio = np.full(800, level, dtype=np.int16)
+            expected = silence_detector._calculate_rms_energy(audio) > threshold
+            assert silence_detector._exceeds_energy_threshold(audio) is expected
+        assert silence_detector._exceeds_energy_threshold(np.zeros(0, dtype=np.int16)) is False
+
+    def test_sum_of_squares_matches_numpy_path(self, sample_audio_data):
+        """Test that the energy kernel gives the same sum on every backend."""
+        from src.livetranscripts.batching import _sum_of_squares, _sum_of_squares_numpy
+        
+        exact = float(np.dot(sample_audio_data.astype(np.int64), sample_audio_data.astype(np.int64)))
+        assert _sum_of_squares(sample_audio_data) == pytest.approx(exact, rel=1e-6)
+        assert _sum_of_squares_numpy(sample_audio_data) == pytest.approx(exact, rel=1e-6)
+
+    def test_energy_calculation_dispatches_to_numpy_rms(self, silence_detector):
+        """Test that the optional numpy-rms kernel is used when installed."""
+        from src.livetranscripts import batching
+        
+        audio = np.full(1000, -300, dtype=np.int16)
+        with patch.object(batching, "numpy_rms", None):
+            assert silence_detector._calculate_rms_energy(audio) == pytest.approx(300.0)
+        
+        fake_rms = Mock(return_value=np.array([42.0], dtype=np.float32))
+        with patch.object(batching, "numpy_rms", Mock(rms=fake_rms)):
+            assert silence_detector._calculate_rms_energy(audio) == 42.0
+        samples = fake_rms.call_args.args[0]
+        assert samples.dtype == np.float32
+        assert fake_rms.call_args.kwargs == {"window_size": 1000}
+
 
 class TestBatchQueue:
     """Test the batch queue management."""
@@ -248,7 +290,7 @@ class TestVADAudioBatcher:
     def test_batcher_initialization(self, vad_batcher, batcher_config):
         """Test batcher initialization."""
         assert vad_batcher.config == batcher_config
-        assert vad_batcher.current_batch == []
+        assert len(vad_batcher.current_batch) == 0
         assert vad_batcher.sequence_id == 0
         assert vad_batcher.is_processing is False
 
@@ -261,6 +303,7 @@ class TestVADAudioBatcher:
         batch = await vad_batcher.add_audio_chunk(audio_chunk)
         assert batch is None
         assert len(vad_batcher.current_batch) == 8000
+        np.testing.assert_array_equal(vad_batcher.current_batch, audio_chunk)
 
     @pytest.mark.asyncio
     async def test_force_batch_on_max_duration(self, vad_batcher):
@@ -325,7 +368,7 @@ class TestVADAudioBatcher:
         
         # Create a batch
         audio_data = np.random.randint(-32768, 32767, 48000, dtype=np.int16)  # 3 seconds
-        vad_batcher.current_batch = audio_data.tolist()
+        vad_batcher._append_audio(audio_data)
         vad_batcher.batch_start_time = datetime.now()
         
         batch = vad_batcher._create_batch()
@@ -333,6 +376,42 @@ class TestVADAudioBatcher:
         assert batch.sequence_id == initial_id
         assert vad_batcher.sequence_id == initial_id + 1
 
+    @pytest.mark.asyncio
+    async def test_batch_buffer_is_reused_and_grows(self, vad_batcher):
+        """Test that batches own their samples while the buffer is reused."""
+        first = np.full(48000, 7, dtype=np.int16)
+        vad_batcher._append_audio(first)
+        batch = await vad_batcher.force_batch()
+        assert len(vad_batcher.current_batch) == 0
+        
+        # Overshooting the preallocated max duration grows the buffer in place
+        loud = np.full(170000, -3, dtype=np.int16)
+        vad_batcher._append_audio(loud)
+        assert len(vad_batcher.current_batch) == 170000
+        np.testing.assert_array_equal(vad_batcher.current_batch, loud)
+        np.testing.assert_array_equal(batch.audio_data, first)
+        
+        # Only the overlap tail of the finished batch is kept, as its own copy
+        overlap_samples = int(vad_batcher.config.overlap_duration * vad_batcher.config.sample_rate)
+        assert len(vad_batcher.previous_batch_audio) == overlap_samples
+        assert not np.shares_memory(vad_batcher.previous_batch_audio, batch.audio_data)
+
+    @pytest.mark.asyncio
+    async def test_chunk_energy_is_computed_while_copying(self, vad_batcher, sample_audio_data):
+        """Test that the silence detector reuses the sum taken during the copy."""
+        from src.livetranscripts.batching import _copy_and_sum_squares_numpy, _sum_of_squares
+        
+        buffer = np.zeros(len(sample_audio_data) + 10, dtype=np.int16)
+        total = _copy_and_sum_squares_numpy(sample_audio_data, buffer, 10)
+        np.testing.assert_array_equal(buffer[10:], sample_audio_data)
+        assert total == pytest.approx(_sum_of_squares(sample_audio_data), rel=1e-6)
+        
+        with patch.object(vad_batcher.silence_detector, "is_silence",
+                          wraps=vad_batcher.silence_detector.is_silence) as is_silence:
+            await vad_batcher.add_audio_chunk(sample_audio_data)
+        assert is_silence.call_args.args[1] == pytest.approx(total, rel=1e-6)
+        np.testing.assert_array_equal(vad_batcher.current_batch, sample_audio_data)
+
     @pytest.mark.asyncio
     async def test_concurrent_processing(self, vad_batcher):
         """Test that batcher handles concurrent audio chunk additions."""
@@ -39,6 +39,25 @@ class TestGPT4oConfig:
         with pytest.raises(ValueError, match="Unsupported transcription model"):
             TranscriptionConfig(transcription_model="invalid-model")
 
+    @pytest.mark.parametrize("field, value", [
+        ("max_concurrent_requests", 0),
+        ("max_concurrent_batches", 0),
+        ("history_max", 0),
+        ("result_cache_size", -1),
+        ("silence_peak_threshold", -1),
+        ("requests_per_minute", 0),
+        ("hedge_delay", -1.0),
+    ])
+    def test_transcription_config_rejects_invalid_limits(self, field, value):
+        """Test that concurrency, cache and pacing limits are validated."""
+        from src.livetranscripts.config import TranscriptionConfig
+        
+        with pytest.raises(ValueError, match=field):
+            TranscriptionConfig(**{field: value})
+        
+        # None disables the optional limits
+        TranscriptionConfig(requests_per_minute=None, hedge_delay=None)
+
 
 class TestGPT4oClient:
     """Test GPT-4o transcription client."""
@@ -71,6 +90,16 @@ class TestGPT4oClient:
         assert hasattr(whisper_client, 'transcribe_batch')
         assert hasattr(whisper_client, 'get_statistics')
 
+    def test_gpt4o_client_uses_slots(self):
+        """Test that transcription clients carry no per-instance __dict__."""
+        from src.livetranscripts.transcription import GPT4oClient, TranscriptionConfig
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe")
+        client = GPT4oClient(config, api_key="test_key")
+
+        assert not hasattr(client, '__dict__')
+        assert client.api_key == "test_key"
+
     @pytest.mark.asyncio
     async def test_gpt4o_transcribe_batch(self):
         """Test GPT-4o batch transcription."""
@@ -109,6 +138,43 @@ class TestGPT4oClient:
             assert result.batch_id == 1
             mock_client.audio.transcriptions.create.assert_called_once()
 
+    def test_gpt4o_requests_plain_json(self):
+        """Test that GPT-4o requests the json format its models support."""
+        from src.livetranscripts.transcription import GPT4oClient, TranscriptionConfig
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", whisper_language="de")
+        client = GPT4oClient(config, api_key="test_key")
+        params = client._format_request_parameters()
+        assert params["response_format"] == "json"
+        assert params["language"] == "de"
+
+        response = Mock(spec=["text"], text=" Hallo ")
+        batch = AudioBatch(np.zeros(16000, dtype=np.int16), datetime.now(), 1.0, sequence_id=3)
+        result = client._process_response(response, batch)
+        assert result.text == "Hallo"
+        assert result.language == "de"
+        assert len(result.segments) == 1
+
+    def test_gpt4o_statistics_track_running_averages(self):
+        """Test that averages are kept up to date as requests finish."""
+        from src.livetranscripts.transcription import GPT4oClient, TranscriptionConfig
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe")
+        client = GPT4oClient(config, api_key="test_key")
+
+        assert client.get_statistics()['success_rate'] == 0.0
+        client._stats['total_requests'] = 3
+        client._record_success(1.0)
+        client._record_success(2.0)
+        client._stats['failed_requests'] += 1
+        client._update_success_rate()
+
+        stats = client.get_statistics()
+        assert stats['average_processing_time'] == pytest.approx(1.5)
+        assert stats['success_rate'] == pytest.approx(2 / 3)
+        stats['successful_requests'] = 99
+        assert client.get_statistics()['successful_requests'] == 2
+
 
 class TestTranscriptionRegistry:
     """Test transcription model registry."""
@@ -149,4 +215,16 @@ class TestTranscriptionRegistry:
         
         models = registry.get_supported_models()
         assert "gpt-4o-transcribe" in models
-        assert "whisper-1" in models
\ No newline at end of file
+        assert "whisper-1" in models
+
+    def test_register_client_with_config_factory(self):
+        """Test that a config factory is stored alongside the client class."""
+        from src.livetranscripts.transcription import TranscriptionRegistry, GPT4oClient
+        
+        registry = TranscriptionRegistry()
+        factory = Mock()
+        registry.register_client("gpt-4o-transcribe", GPT4oClient, factory)
+        registry.register_client("gpt-4o-mini-transcribe", GPT4oClient)
+        
+        assert registry.get_config_factory("gpt-4o-transcribe") is factory
+        assert registry.get_config_factory("gpt-4o-mini-transcribe") is None
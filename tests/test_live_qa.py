@@ -3,6 +3,7 @@
 import pytest
 import asyncio
 import json
+import numpy as np
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from datetime import datetime
 import websockets
@@ -17,6 +18,7 @@ from src.livetranscripts.live_qa import (
     ConnectionState,
 )
 from src.livetranscripts.gemini_integration import QAHandler, GeminiConfig, ContextManager
+from tests.conftest import sent_messages
 
 
 class TestQARequest:
@@ -467,13 +469,41 @@ class TestWebSocketHandler:
         
         # Should have sent KB content on connect
         mock_websocket.send.assert_called()
-        sent_messages = [json.loads(call[0][0]) for call in mock_websocket.send.call_args_list]
+        messages = sent_messages(mock_websocket)
         
         # Find KB content message
-        kb_content_msg = next((msg for msg in sent_messages if msg.get("type") == "kb_content"), None)
+        kb_content_msg = next((msg for msg in messages if msg.get("type") == "kb_content"), None)
         assert kb_content_msg is not None
         assert kb_content_msg["content"] == "# Existing KB\n\nExisting content"
 
+    def test_json_codec_matches_stdlib_without_orjson(self):
+        """Test that messages encode to str whether or not orjson is installed."""
+        from src.livetranscripts import live_qa
+        
+        message = {"type": "status", "count": 2}
+        with patch.object(live_qa, "orjson", None):
+            encoded = live_qa._json_dumps(message)
+            assert encoded == json.dumps(message)
+            assert live_qa._json_loads(encoded) == message
+        
+        # Non-str keys are accepted whichever encoder is active
+        assert json.loads(live_qa._json_dumps({1: "a"})) == {"1": "a"}
+        with pytest.raises(json.JSONDecodeError):
+            live_qa._json_loads("{not json")
+
+    def test_json_codec_serializes_numpy_payloads(self):
+        """Test that numpy levels encode as plain lists on either encoder."""
+        from src.livetranscripts import live_qa
+        
+        message = {"type": "audio_levels", "levels": np.array([1, -2, 3], dtype=np.int16),
+                   "peak": np.float32(0.5)}
+        expected = {"type": "audio_levels", "levels": [1, -2, 3], "peak": 0.5}
+        assert json.loads(live_qa._json_dumps(message)) == expected
+        with patch.object(live_qa, "orjson", None):
+            assert json.loads(live_qa._json_dumps(message)) == expected
+            with pytest.raises(TypeError):
+                live_qa._json_dumps({"when": object()})
+
 
 class TestLiveQAServer:
     """Test the main Live Q&A server."""
@@ -543,6 +573,57 @@ class TestLiveQAServer:
         assert "questions_processed" in stats
         assert "average_response_time" in stats
 
+    @pytest.mark.asyncio
+    async def test_broadcast_burst_is_coalesced(self, qa_server):
+        """Test that broadcasts queued within the window are sent as one frame."""
+        mock_websocket = AsyncMock()
+        qa_server.active_connections.add(mock_websocket)
+
+        transcript = Mock(text="Hello", timestamp=datetime.now(), batch_id=1)
+        await qa_server.broadcast_transcript(transcript)
+        await qa_server.broadcast_suggested_questions(["What next?"])
+        await asyncio.sleep(qa_server.broadcast_coalesce_window * 5)
+
+        mock_websocket.send.assert_called_once()
+        frame = json.loads(mock_websocket.send.call_args[0][0])
+        assert frame["type"] == MessageType.BATCH.value
+        assert [item["type"] for item in frame["items"]] == [
+            MessageType.TRANSCRIPT.value,
+            MessageType.SUGGESTED_QUESTIONS.value,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once_for_all_clients(self, qa_server):
+        """Test that every client is sent the same encoded payload."""
+        clients = [AsyncMock(), AsyncMock(), AsyncMock()]
+        qa_server.active_connections.update(clients)
+
+        await qa_server.broadcast_message({"type": MessageType.STATUS.value, "message": "hi"})
+
+        payloads = [client.send.call_args[0][0] for client in clients]
+        assert all(payload is payloads[0] for payload in payloads)
+        assert json.loads(payloads[0])["message"] == "hi"
+
+    @pytest.mark.asyncio
+    async def test_single_broadcast_is_not_wrapped(self, qa_server):
+        """Test that a lone broadcast is sent as a plain message."""
+        mock_websocket = AsyncMock()
+        qa_server.active_connections.add(mock_websocket)
+
+        await qa_server.broadcast_suggested_questions(["What next?"])
+        await asyncio.sleep(qa_server.broadcast_coalesce_window * 5)
+
+        frame = json.loads(mock_websocket.send.call_args[0][0])
+        assert frame["type"] == MessageType.SUGGESTED_QUESTIONS.value
+
+    @pytest.mark.asyncio
+    async def test_broadcast_skipped_without_clients(self, qa_server):
+        """Test that broadcasts are dropped before queuing when nobody is connected."""
+        await qa_server.broadcast_suggested_questions(["What next?"])
+
+        assert qa_server._pending_broadcasts == []
+        assert qa_server._flush_task is None
+
 
 class TestIntegrationScenarios:
     """Test realistic integration scenarios."""
@@ -1,6 +1,7 @@
 """Test that recording starts in OFF state by default."""
 import asyncio
 import json
+from datetime import datetime
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 
@@ -30,8 +31,8 @@ class TestRecordingDefaultState:
 
     async def test_app_does_not_process_audio_when_paused(self):
         """Test that audio processing is skipped when recording is paused."""
-        with patch('src.livetranscripts.main.AudioCapture') as mock_audio_capture:
-            with patch('src.livetranscripts.main.BatchProcessor') as mock_batch_processor:
+        with patch('src.livetranscripts.audio_capture.AudioCapture') as mock_audio_capture:
+            with patch('src.livetranscripts.batching.BatchProcessor') as mock_batch_processor:
                 # Setup mocks
                 mock_audio_capture_instance = AsyncMock()
                 mock_audio_capture.return_value = mock_audio_capture_instance
@@ -58,6 +59,53 @@ class TestRecordingDefaultState:
                 mock_audio_capture_instance.get_audio_chunk.assert_not_called()
                 mock_batch_instance.get_next_batch.assert_not_called()
 
+    async def test_app_waits_for_audio_without_polling(self):
+        """Test that the audio loop drains queued chunks and then waits on the producer."""
+        chunk = Mock(data=b"audio")
+        mock_audio_capture = Mock()
+        mock_audio_capture.get_audio_chunk_nowait = Mock(side_effect=[chunk, None])
+        mock_audio_capture.chunk_available = asyncio.Event()
+        
+        mock_batch = AsyncMock()
+        mock_batch.get_next_batch = AsyncMock(return_value=None)
+        
+        app = LiveTranscriptsApp()
+        app.audio_capture = mock_audio_capture
+        app.batch_processor = mock_batch
+        app.recording_paused = False
+        app.is_running = True
+        
+        process_task = asyncio.create_task(app._audio_processing_loop())
+        await asyncio.sleep(0.05)
+        
+        # One chunk processed, loop now parked on the event
+        mock_batch.process_audio_chunk.assert_awaited_once_with(b"audio")
+        assert mock_audio_capture.get_audio_chunk_nowait.call_count == 2
+        assert not process_task.done()
+        
+        process_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await process_task
+
+    async def test_stop_wakes_audio_loop_waiting_for_chunks(self):
+        """Test that stopping ends the audio loop even if no more audio arrives."""
+        mock_audio_capture = Mock()
+        mock_audio_capture.get_audio_chunk_nowait = Mock(return_value=None)
+        mock_audio_capture.chunk_available = asyncio.Event()
+        mock_audio_capture.stop_capture = AsyncMock()
+        
+        app = LiveTranscriptsApp()
+        app.audio_capture = mock_audio_capture
+        app.recording_paused = False
+        app.is_running = True
+        
+        process_task = asyncio.create_task(app._audio_processing_loop())
+        await asyncio.sleep(0.01)
+        assert not process_task.done()
+        
+        await app.stop()
+        await asyncio.wait_for(process_task, timeout=0.5)
+
     async def test_recording_can_be_resumed_after_starting_paused(self):
         """Test that recording can be resumed after starting paused."""
         # Create LiveTranscriptsApp
@@ -96,4 +144,52 @@ class TestRecordingDefaultState:
         mock_websocket.send.assert_called_once_with(status_msg)
         sent_data = mock_websocket.send.call_args[0][0]
         assert '"type": "recording_status"' in sent_data
-        assert '"is_recording": false' in sent_data
\ No newline at end of file
+        assert '"is_recording": false' in sent_data
+
+    async def test_insights_broadcast_through_single_worker(self):
+        """Test that insight callbacks are drained by one long-lived broadcaster."""
+        app = LiveTranscriptsApp()
+        app.qa_server = AsyncMock()
+        app._loop = asyncio.get_running_loop()
+        
+        insight = Mock(timestamp=datetime(2024, 1, 1, 9, 5, 7))
+        insight.type.value = "summary"
+        insight.content = "Test insight"
+        
+        worker = asyncio.create_task(app._insight_broadcast_loop())
+        app._on_insight_generated(insight)
+        app._on_insight_generated(insight)
+        await asyncio.sleep(0.05)
+        
+        assert app.qa_server.broadcast_insight.await_count == 2
+        assert app.stats.insights_generated == 2
+        
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+
+    async def test_repeated_shutdown_requests_stop_once(self):
+        """Test that multiple shutdown requests end start() with a single stop."""
+        app = LiveTranscriptsApp()
+        app.audio_capture = AsyncMock()
+        app.audio_capture.chunk_available = asyncio.Event()
+        app.batch_processor = AsyncMock()
+        app.transcription_manager = AsyncMock()
+        app.insight_generator = Mock()
+        app.insight_generator.start_automated_insights = AsyncMock()
+        app.qa_server = Mock(port=8765, http_port=8766)
+        app.qa_server.start = AsyncMock()
+        
+        original_stop = app.stop
+        app.stop = AsyncMock(side_effect=original_stop)
+        
+        start_task = asyncio.create_task(app.start())
+        await asyncio.sleep(0.05)
+        assert app.is_running is True
+        
+        app.request_shutdown()
+        app.request_shutdown()
+        await asyncio.wait_for(start_task, timeout=1.0)
+        
+        app.stop.assert_awaited_once()
+        assert app.is_running is False
@@ -123,4 +123,511 @@ class TestTranscriptionManagerFallback:
             # Should succeed with final fallback
             assert result.text == "Final fallback success"
             # Should have made 3 API calls (primary + 2 fallbacks)
-            assert mock_client.audio.transcriptions.create.call_count == 3
\ No newline at end of file
+            assert mock_client.audio.transcriptions.create.call_count == 3
+
+
+class TestTranscriptionManagerHedging:
+    """Test hedged fallback requests in transcription manager."""
+
+    @staticmethod
+    def _make_batch():
+        return AudioBatch(
+            audio_data=np.random.randint(-16000, 16000, 16000, dtype=np.int16),
+            timestamp=datetime.now(),
+            duration=1.0,
+            sequence_id=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_by_fallback(self):
+        """Test that a stalled primary is overtaken by the hedged fallback."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(
+            transcription_model="gpt-4o-transcribe",
+            model_fallback=["gpt-4o-mini-transcribe"],
+            hedge_delay=0.05
+        )
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        primary_cancelled = asyncio.Event()
+
+        async def stalled(wav_bytes, batch):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+
+        primary = Mock(transcribe_wav=stalled)
+        fallback = Mock(transcribe_wav=AsyncMock(return_value=Mock(text="Hedged success")))
+        clients = {"gpt-4o-transcribe": primary, "gpt-4o-mini-transcribe": fallback}
+        manager._get_client = clients.__getitem__
+
+        result = await asyncio.wait_for(manager.transcribe_batch_with_fallback(self._make_batch()), 1.0)
+
+        assert result.text == "Hedged success"
+        await asyncio.wait_for(primary_cancelled.wait(), 1.0)
+
+    @pytest.mark.asyncio
+    async def test_lost_hedge_does_not_count_as_a_failure(self):
+        """Test that a cancelled hedged request is left out of the success rate."""
+        from src.livetranscripts.transcription import GPT4oClient, TranscriptionManager
+
+        config = TranscriptionConfig(
+            transcription_model="gpt-4o-transcribe",
+            model_fallback=["gpt-4o-mini-transcribe"],
+            hedge_delay=0.05
+        )
+        manager = TranscriptionManager(config, api_key="test_key")
+        primary = GPT4oClient(config, api_key="test_key")
+        responses = iter([Mock(spec=["text"], text="First")])
+
+        async def create(**kwargs):
+            # The first request answers; the next one stalls until the hedge wins
+            response = next(responses, None)
+            if response is None:
+                await asyncio.sleep(10)
+            return response
+
+        primary.client = Mock()
+        primary.client.audio.transcriptions.create = create
+        fallback = Mock(
+            transcribe_wav=AsyncMock(return_value=Mock(text="Hedged success")),
+            get_statistics=Mock(return_value={})
+        )
+        manager._clients = {"gpt-4o-transcribe": primary, "gpt-4o-mini-transcribe": fallback}
+        manager._get_client = manager._clients.__getitem__
+
+        assert (await manager.transcribe_batch_with_fallback(self._make_batch())).text == "First"
+        # Awaited directly, so the loop gets no turn between the race and the stats read
+        result = await manager.transcribe_batch_with_fallback(self._make_batch())
+
+        assert result.text == "Hedged success"
+        # The cancellation is already counted when the race returns
+        stats = manager.get_statistics()['client_stats']["gpt-4o-transcribe"]
+        assert stats['total_requests'] == 2
+        assert stats['cancelled_requests'] == 1
+        assert stats['failed_requests'] == 0
+        assert stats['success_rate'] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_all_models_failing_raises_last_error(self):
+        """Test that the last failure is raised when every model fails."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(
+            transcription_model="gpt-4o-transcribe",
+            model_fallback=["gpt-4o-mini-transcribe"],
+            hedge_delay=0.05
+        )
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        clients = {
+            "gpt-4o-transcribe": Mock(transcribe_wav=AsyncMock(side_effect=RuntimeError("primary down"))),
+            "gpt-4o-mini-transcribe": Mock(transcribe_wav=AsyncMock(side_effect=RuntimeError("fallback down"))),
+        }
+        manager._get_client = clients.__getitem__
+
+        with pytest.raises(RuntimeError, match="fallback down"):
+            await manager.transcribe_batch_with_fallback(self._make_batch())
+
+    @pytest.mark.asyncio
+    async def test_audio_is_encoded_once_for_all_attempts(self):
+        """Test that every fallback attempt receives the same encoded audio."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(
+            transcription_model="gpt-4o-transcribe",
+            model_fallback=["gpt-4o-mini-transcribe"]
+        )
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        primary = Mock(transcribe_wav=AsyncMock(side_effect=RuntimeError("primary down")))
+        fallback = Mock(transcribe_wav=AsyncMock(return_value=Mock(text="ok")))
+        clients = {"gpt-4o-transcribe": primary, "gpt-4o-mini-transcribe": fallback}
+        manager._get_client = clients.__getitem__
+
+        await manager.transcribe_batch_with_fallback(self._make_batch())
+
+        primary_wav = primary.transcribe_wav.call_args[0][0]
+        assert primary_wav[:4] == b"RIFF"
+        assert fallback.transcribe_wav.call_args[0][0] is primary_wav
+
+    @pytest.mark.asyncio
+    async def test_audio_is_encoded_off_the_event_loop(self):
+        """Test that preprocessing and WAV encoding run in a worker thread."""
+        import threading
+        from src.livetranscripts.transcription import TranscriptionManager
+        from src.livetranscripts.whisper_integration import AudioProcessor
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", model_fallback=[])
+        manager = TranscriptionManager(config, api_key="test_key")
+        manager._get_client = Mock(return_value=Mock(transcribe_wav=AsyncMock(return_value=Mock(text="ok"))))
+        encode_threads = []
+        encode = AudioProcessor.preprocess_to_wav
+
+        def recording_encode(audio_data, *args):
+            encode_threads.append(threading.current_thread())
+            return encode(audio_data, *args)
+
+        with patch.object(AudioProcessor, 'preprocess_to_wav', side_effect=recording_encode):
+            await manager.transcribe_batch_with_fallback(self._make_batch())
+
+        assert len(encode_threads) == 1
+        assert encode_threads[0] is not threading.main_thread()
+
+
+class TestTranscriptionHistory:
+    """Test bounded transcription history."""
+
+    def test_history_is_bounded(self):
+        """Test that old results are dropped once history_max is reached."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", history_max=3)
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        for i in range(5):
+            manager.transcription_history.append(Mock(text=f"segment {i}"))
+
+        assert len(manager.transcription_history) == 3
+        assert [r.text for r in manager.get_recent_transcriptions(2)] == ["segment 3", "segment 4"]
+        assert len(manager.get_recent_transcriptions(10)) == 3
+
+    def test_full_transcript_is_cached_until_next_result(self):
+        """Test that the full transcript is rebuilt only after new results."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", history_max=2)
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        manager._record_result(Mock(text="Hello"))
+        manager._record_result(Mock(text="world"))
+        first = manager.get_full_transcript()
+        assert first == "Hello world"
+        assert manager.get_full_transcript() is first
+
+        # Full transcript outlives the bounded history
+        manager._record_result(Mock(text="again"))
+        assert manager.get_full_transcript() == "Hello world again"
+        assert len(manager.transcription_history) == 2
+
+
+class TestTranscriptionCallbacks:
+    """Test result callback dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_callbacks_run_concurrently_and_errors_are_isolated(self):
+        """Test that callbacks overlap and one failure doesn't block the others."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe")
+        manager = TranscriptionManager(config, api_key="test_key")
+        result = Mock(text="Hello")
+        manager.transcribe_batch_with_fallback = AsyncMock(return_value=result)
+
+        second_started = asyncio.Event()
+        received = []
+
+        async def slow_callback(res):
+            # Only completes if the next callback runs while this one waits
+            await asyncio.wait_for(second_started.wait(), 1.0)
+            received.append(res)
+
+        async def failing_callback(res):
+            second_started.set()
+            raise RuntimeError("callback failed")
+
+        sync_received = []
+        wrapped_received = []
+
+        async def record_wrapped(res):
+            wrapped_received.append(res)
+
+        manager.add_result_callback(slow_callback)
+        manager.add_result_callback(failing_callback)
+        manager.add_result_callback(sync_received.append)
+        # Returns a coroutine without being a coroutine function itself
+        manager.add_result_callback(lambda res: record_wrapped(res))
+
+        await manager.start_processing()
+        await manager.transcribe_batch(Mock())
+        await asyncio.sleep(0.1)
+        await manager.stop_processing()
+
+        assert received == [result]
+        assert sync_received == [result]
+        assert wrapped_received == [result]
+
+
+class TestClientLifecycle:
+    """Test that the manager releases its clients."""
+
+    @pytest.mark.asyncio
+    async def test_close_releases_cached_clients(self):
+        """Test that close() shuts down every cached client that holds resources."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe")
+        manager = TranscriptionManager(config, api_key="test_key")
+        gemini = Mock()
+        openai_client = Mock(close=AsyncMock())
+        manager._clients = {
+            "gemini-2.0-flash-transcribe": gemini,
+            "gpt-4o-transcribe": openai_client,
+            "whisper-1": Mock(spec=["transcribe_wav"]),
+        }
+
+        await manager.close()
+
+        gemini.close.assert_called_once()
+        openai_client.close.assert_awaited_once()
+        assert manager._clients == {}
+
+    @pytest.mark.asyncio
+    async def test_close_releases_openai_connection_pools(self):
+        """Test that close() reaches the HTTP client of every OpenAI-based client."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", model_fallback=["whisper-1"])
+        manager = TranscriptionManager(config, api_key="test_key")
+        clients = [manager._get_client("gpt-4o-transcribe"), manager._get_client("whisper-1")]
+        for client in clients:
+            client.client.close = AsyncMock()
+
+        await manager.close()
+
+        for client in clients:
+            client.client.close.assert_awaited_once()
+
+
+class TestProcessingLoop:
+    """Test the transcription processing loop lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_stop_processing_wakes_idle_loop(self):
+        """Test that stopping an idle loop exits without waiting on a timeout."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe")
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        manager.is_processing = True
+        loop_task = asyncio.create_task(manager._process_queue())
+        await asyncio.sleep(0)
+
+        await manager.stop_processing()
+        await asyncio.wait_for(loop_task, 0.1)
+        assert loop_task.done()
+
+    @pytest.mark.asyncio
+    async def test_restart_after_stop_during_inflight_work(self):
+        """Test that a stop queued behind busy work doesn't end the next run."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", max_concurrent_batches=1)
+        manager = TranscriptionManager(config, api_key="test_key")
+        release = asyncio.Event()
+
+        async def transcribe(batch):
+            if batch.text == "one":
+                await release.wait()
+            return Mock(text=batch.text)
+
+        manager.transcribe_batch_with_fallback = transcribe
+        delivered = []
+        manager.add_result_callback(AsyncMock(side_effect=lambda r: delivered.append(r.text)))
+
+        await manager.start_processing()
+        await manager.transcribe_batch(Mock(text="one"))
+        await manager.transcribe_batch(Mock(text="two"))
+        await asyncio.sleep(0.01)
+        # The loop is waiting for a slot while holding "two"; stopping waits for both
+        stopping = asyncio.create_task(manager.stop_processing())
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+        release.set()
+        await asyncio.wait_for(stopping, 1.0)
+        assert delivered == ["one", "two"]
+
+        await manager.start_processing()
+        await manager.transcribe_batch(Mock(text="three"))
+        await asyncio.sleep(0.05)
+
+        assert delivered == ["one", "two", "three"]
+        assert manager._next_dispatch == 3
+        assert manager._processing_queue.empty()
+
+        # Stopping with no loop running leaves a sentinel the next run must skip
+        await manager.stop_processing()
+        await asyncio.sleep(0.01)
+        await manager.stop_processing()
+        await manager.start_processing()
+        await manager.transcribe_batch(Mock(text="four"))
+        await asyncio.sleep(0.05)
+        await manager.stop_processing()
+
+        assert delivered == ["one", "two", "three", "four"]
+
+    @pytest.mark.asyncio
+    async def test_batches_run_in_parallel_and_deliver_in_order(self):
+        """Test that batches overlap up to the limit but results keep queue order."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", max_concurrent_batches=2)
+        manager = TranscriptionManager(config, api_key="test_key")
+
+        in_flight = 0
+        peak = 0
+
+        async def transcribe(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Earlier batches take longer, so they finish out of order
+            await asyncio.sleep(batch.delay)
+            in_flight -= 1
+            return Mock(text=batch.text)
+
+        manager.transcribe_batch_with_fallback = transcribe
+        delivered = []
+        manager.add_result_callback(AsyncMock(side_effect=lambda r: delivered.append(r.text)))
+
+        await manager.start_processing()
+        for text, delay in [("one", 0.05), ("two", 0.01), ("three", 0.01)]:
+            await manager.transcribe_batch(Mock(text=text, delay=delay))
+        await asyncio.sleep(0.2)
+        await manager.stop_processing()
+
+        assert delivered == ["one", "two", "three"]
+        assert peak == 2
+        assert manager.get_full_transcript() == "one two three"
+
+    @pytest.mark.asyncio
+    async def test_client_statistics_refresh_only_after_batches(self):
+        """Test that per-client stats are re-collected only when a batch finishes."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", model_fallback=[])
+        manager = TranscriptionManager(config, api_key="test_key")
+        client = Mock()
+        client.get_statistics.return_value = {'total_requests': 1}
+        client.transcribe_wav = AsyncMock(return_value=Mock(text="Hello"))
+        manager._clients["gpt-4o-transcribe"] = client
+
+        await manager.transcribe_batch_with_fallback(Mock(wav_bytes=b"first", audio_data=np.full(100, 1000, dtype=np.int16)))
+        manager.get_statistics()
+        stats = manager.get_statistics()
+        assert client.get_statistics.call_count == 1
+        assert stats['client_stats'] == {"gpt-4o-transcribe": {'total_requests': 1}}
+        stats['client_stats']["gpt-4o-transcribe"]['total_requests'] = 99
+        assert manager.get_statistics()['client_stats']["gpt-4o-transcribe"]['total_requests'] == 1
+
+        await manager.transcribe_batch_with_fallback(Mock(wav_bytes=b"second", audio_data=np.full(100, 1000, dtype=np.int16)))
+        manager.get_statistics()
+        assert client.get_statistics.call_count == 2
+
+
+class TestResultCache:
+    """Test reuse of results for identical audio."""
+
+    @staticmethod
+    def _manager(**config_kwargs):
+        """Create a manager whose primary client is a stub."""
+        from src.livetranscripts.transcription import TranscriptionManager
+        from src.livetranscripts.whisper_integration import TranscriptionResult
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe", model_fallback=[], **config_kwargs)
+        manager = TranscriptionManager(config, api_key="test_key")
+        client = Mock()
+        client.transcribe_wav = AsyncMock(side_effect=lambda wav, batch: TranscriptionResult(
+            text="Hello", segments=[], language="en", duration=1.0,
+            batch_id=batch.sequence_id, timestamp=batch.timestamp
+        ))
+        manager._clients["gpt-4o-transcribe"] = client
+        return manager, client
+
+    @pytest.mark.asyncio
+    async def test_identical_audio_is_served_from_cache(self):
+        """Test that repeated audio skips the API and gets its own batch metadata."""
+        manager, client = self._manager()
+        audio = np.full(100, 1000, dtype=np.int16)
+        first = Mock(wav_bytes=b"audio", audio_data=audio, sequence_id=1, timestamp=datetime(2024, 1, 1))
+        replay = Mock(wav_bytes=b"audio", audio_data=audio, sequence_id=2, timestamp=datetime(2024, 1, 2))
+
+        await manager.transcribe_batch_with_fallback(first)
+        result = await manager.transcribe_batch_with_fallback(replay)
+
+        assert client.transcribe_wav.call_count == 1
+        assert result.text == "Hello"
+        assert result.batch_id == 2
+        assert result.timestamp == datetime(2024, 1, 2)
+
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(self):
+        """Test that the cache stays within its size limit."""
+        manager, client = self._manager(result_cache_size=1)
+
+        for audio in (b"one", b"two", b"one"):
+            await manager.transcribe_batch_with_fallback(
+                Mock(wav_bytes=audio, audio_data=np.full(100, 1000, dtype=np.int16),
+                     sequence_id=1, timestamp=datetime.now())
+            )
+
+        assert client.transcribe_wav.call_count == 3
+        assert len(manager._result_cache) == 1
+
+
+class TestSilenceSkipping:
+    """Test that silent batches never reach the API."""
+
+    @pytest.mark.asyncio
+    async def test_silent_batch_returns_empty_result_without_api_call(self):
+        """Test that a batch below the peak threshold gets an empty result."""
+        from src.livetranscripts.transcription import TranscriptionManager
+
+        config = TranscriptionConfig(transcription_model="gpt-4o-transcribe")
+        manager = TranscriptionManager(config, api_key="test_key")
+        manager._get_client = Mock()
+        batch = AudioBatch(
+            audio_data=np.random.randint(-100, 100, 16000, dtype=np.int16),
+            timestamp=datetime.now(),
+            duration=1.0,
+            sequence_id=5
+        )
+
+        result = await manager.transcribe_batch_with_fallback(batch)
+
+        assert result.text == ""
+        assert result.batch_id == 5
+        assert result.duration == 1.0
+        manager._get_client.assert_not_called()
+        assert batch._wav_bytes is None
+
+    @pytest.mark.asyncio
+    async def test_silent_batch_is_not_recorded_or_announced(self):
+        """Test that a skipped batch reaches neither callbacks nor the transcript."""
+        from src.livetranscripts.transcription import TranscriptionManager
+        from src.livetranscripts.whisper_integration import TranscriptionResult
+
+        config = TranscriptionConfig(
+            transcription_model="gpt-4o-transcribe", model_fallback=[], result_cache_size=0
+        )
+        manager = TranscriptionManager(config, api_key="test_key")
+        client = Mock(transcribe_wav=AsyncMock(side_effect=[
+            TranscriptionResult("one", [], "en", 1.0, 0),
+            TranscriptionResult("three", [], "en", 1.0, 2),
+        ]))
+        manager._get_client = Mock(return_value=client)
+        callback = AsyncMock()
+        manager.add_result_callback(callback)
+
+        for seq, peak in enumerate([1000, 50, 1000]):
+            batch = AudioBatch(np.full(16000, peak, dtype=np.int16), datetime.now(), sequence_id=seq)
+            await manager._inflight_sem.acquire()
+            await manager._handle_batch(seq, batch)
+
+        assert [call.args[0].text for call in callback.await_args_list] == ["one", "three"]
+        assert manager.get_full_transcript() == "one three"
+        assert len(manager.get_recent_transcriptions()) == 2
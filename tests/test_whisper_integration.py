@@ -52,6 +52,12 @@ class TestWhisperConfig:
         
         with pytest.raises(ValueError, match="Max retries must be non-negative"):
             WhisperConfig(max_retries=-1)
+        
+        with pytest.raises(ValueError, match="requests_per_minute must be positive"):
+            WhisperConfig(requests_per_minute=0)
+        
+        with pytest.raises(ValueError, match="max_concurrent_batches must be at least 1"):
+            WhisperConfig(max_concurrent_batches=0)
 
 
 class TestTranscriptionSegment:
@@ -169,6 +175,42 @@ class TestTranscriptionResult:
         expected_confidence = (0.9 + 0.8 + 1.0) / 3
         assert abs(result.average_confidence - expected_confidence) < 0.001
 
+    def test_validity_is_computed_once(self):
+        """Test that segment validation runs on the first check only."""
+        segment = Mock(is_valid=Mock(return_value=True))
+        result = TranscriptionResult(
+            text="Hello",
+            segments=[segment],
+            language="en",
+            duration=1.0,
+            batch_id=1
+        )
+        
+        assert result.is_valid() is True
+        assert result.is_valid() is True
+        segment.is_valid.assert_called_once()
+        assert TranscriptionResult("", [], "en", 1.0, 2).is_valid() is False
+
+    def test_average_confidence_is_computed_once(self):
+        """Test that average confidence is cached and ignores unscored segments."""
+        segments = [
+            TranscriptionSegment("First", 0.0, 1.0, 0.9),
+            TranscriptionSegment("Second", 1.0, 2.0, 0.0),
+            TranscriptionSegment("Third", 2.0, 3.0, 0.7)
+        ]
+        result = TranscriptionResult(
+            text="First Second Third",
+            segments=segments,
+            language="en",
+            duration=3.0,
+            batch_id=1
+        )
+        
+        assert result.average_confidence == pytest.approx(0.8)
+        segments[0].confidence = 0.1
+        assert result.average_confidence == pytest.approx(0.8)
+        assert result == TranscriptionResult("First Second Third", segments, "en", 3.0, 1, result.timestamp)
+
 
 class TestAudioProcessor:
     """Test audio processing utilities."""
@@ -191,6 +233,41 @@ class TestAudioProcessor:
                 assert wav_file.getsampwidth() == 2  # 16-bit
                 assert wav_file.getnframes() == 16000
 
+    def test_audio_to_wav_stream(self):
+        """Test encoding audio into a rewound, named WAV file object."""
+        audio_data = np.random.randint(-32768, 32767, 16000, dtype=np.int16)
+        
+        wav_stream = AudioProcessor.audio_to_wav_stream(audio_data, name="batch_7.wav")
+        
+        assert wav_stream.name == "batch_7.wav"
+        assert wav_stream.tell() == 0
+        with wave.open(wav_stream, 'rb') as wav_file:
+            assert wav_file.getnframes() == 16000
+            frames = np.frombuffer(wav_file.readframes(16000), dtype=np.int16)
+        np.testing.assert_array_equal(frames, audio_data)
+
+    def test_preprocess_to_wav(self):
+        """Test that audio is normalized, filtered and encoded for upload."""
+        def decode(wav_bytes):
+            with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+                assert wav_file.getframerate() == 16000
+                return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+        
+        # Normal audio
+        normal_audio = np.random.randint(-16000, 16000, 16000, dtype=np.int16)
+        assert len(decode(AudioProcessor.preprocess_to_wav(normal_audio))) == len(normal_audio)
+        
+        # Silent audio
+        silent_audio = np.zeros(16000, dtype=np.int16)
+        assert len(decode(AudioProcessor.preprocess_to_wav(silent_audio))) == len(silent_audio)
+        
+        # Out-of-range float audio is scaled into int16
+        loud_audio = np.full(16000, 60000.0)
+        assert np.max(decode(AudioProcessor.preprocess_to_wav(loud_audio))) <= 32767
+        
+        # Empty audio still yields a valid WAV
+        assert len(decode(AudioProcessor.preprocess_to_wav(np.array([], dtype=np.int16)))) == 0
+
     def test_normalize_audio(self):
         """Test audio normalization."""
         # Test with clipped audio
@@ -205,6 +282,40 @@ class TestAudioProcessor:
         normalized_normal = AudioProcessor.normalize_audio(normal_audio)
         np.testing.assert_array_equal(normal_audio, normalized_normal)
 
+    def test_normalize_float_audio_matches_numpy_path(self):
+        """Test that out-of-range float audio is scaled the same on every backend."""
+        from src.livetranscripts.whisper_integration import (
+            _abs_peak, _scale_to_int16_numpy
+        )
+        
+        loud_audio = np.random.uniform(-60000, 60000, 4096)
+        normalized = AudioProcessor.normalize_audio(loud_audio)
+        expected = _scale_to_int16_numpy(loud_audio, 32767 / _abs_peak(loud_audio))
+        
+        assert normalized.dtype == np.int16
+        np.testing.assert_array_equal(normalized, expected)
+
+    def test_normalize_can_quantize_in_range_audio(self):
+        """Test that in-range float audio can be returned as int16 PCM."""
+        quiet_audio = np.array([-1000.5, 0.0, 1000.5], dtype=np.float32)
+        
+        np.testing.assert_array_equal(AudioProcessor.normalize_audio(quiet_audio), quiet_audio)
+        quantized = AudioProcessor.normalize_audio(quiet_audio, return_int16=True)
+        assert quantized.dtype == np.int16
+        np.testing.assert_array_equal(quantized, [-1000, 0, 1000])
+
+    def test_apply_filters_matches_numpy_path(self):
+        """Test that smoothing gives the same samples on every backend."""
+        from src.livetranscripts.whisper_integration import _smooth_to_int16_numpy
+        
+        audio = np.random.randint(-32768, 32767, 4096, dtype=np.int16)
+        filtered = AudioProcessor.apply_filters(audio)
+        expected = _smooth_to_int16_numpy(audio, 5)
+        
+        assert filtered.dtype == np.int16
+        # Backends may round the last bit differently before truncation
+        np.testing.assert_allclose(filtered, expected, atol=1)
+
     def test_apply_audio_filters(self):
         """Test audio filtering."""
         # Generate noisy audio
@@ -291,6 +402,89 @@ class TestRetryManager:
         with pytest.raises(Exception, match="Always fails"):
             await always_failing()
 
+    def test_delay_is_capped_and_jittered(self):
+        """Test that backoff delay stays within jitter bounds and the cap."""
+        retry_manager = RetryManager(max_retries=10, base_delay=1.0, max_delay=30.0, jitter=0.5)
+        
+        retry_manager.current_attempt = 2
+        assert 2.0 <= retry_manager.get_delay() <= 3.0
+        
+        retry_manager.current_attempt = 8
+        assert retry_manager.get_delay() == 30.0
+
+    @pytest.mark.asyncio
+    async def test_unrecoverable_error_is_not_retried(self):
+        """Test that errors rejected by retry_on are raised without retrying."""
+        call_count = 0
+        
+        @RetryManager.async_retry(max_retries=3, base_delay=0.1,
+                                  retry_on=lambda e: not isinstance(e, PermissionError))
+        async def forbidden():
+            nonlocal call_count
+            call_count += 1
+            raise PermissionError("Invalid credentials")
+        
+        with pytest.raises(PermissionError):
+            await forbidden()
+        assert call_count == 1
+
+    def test_only_transient_api_errors_are_retryable(self):
+        """Test that rate limits and server errors retry but other 4xx don't."""
+        import openai
+        from src.livetranscripts.whisper_integration import httpx, is_retryable_error, get_retry_after
+        
+        def api_error(error_class, status, headers=None):
+            request = httpx.Request("POST", "https://api.openai.com/v1/audio/transcriptions")
+            response = httpx.Response(status, headers=headers, request=request)
+            return error_class("error", response=response, body=None)
+        
+        rate_limited = api_error(openai.RateLimitError, 429, {"retry-after-ms": "1500"})
+        assert is_retryable_error(rate_limited)
+        assert get_retry_after(rate_limited) == 1.5
+        assert is_retryable_error(api_error(openai.InternalServerError, 503))
+        assert not is_retryable_error(api_error(openai.BadRequestError, 400))
+        assert not is_retryable_error(api_error(openai.AuthenticationError, 401))
+        assert is_retryable_error(ConnectionError("reset"))
+
+
+class TestTokenBucket:
+    """Test client-side request rate limiting."""
+
+    @pytest.mark.asyncio
+    async def test_burst_passes_then_requests_are_paced(self):
+        """Test that requests beyond the burst wait for tokens to refill."""
+        from src.livetranscripts import whisper_integration
+        
+        # Fake clock: sleeping advances time exactly, so no wall-clock bounds are needed
+        now = 100.0
+        sleeps = []
+        
+        async def fake_sleep(delay):
+            nonlocal now
+            sleeps.append(delay)
+            now += delay
+        
+        with patch.object(whisper_integration.time, "monotonic", lambda: now), \
+                patch.object(whisper_integration.asyncio, "sleep", fake_sleep):
+            bucket = whisper_integration.TokenBucket(rate_per_sec=20.0, burst=2)
+            await bucket.acquire()
+            await bucket.acquire()
+            assert sleeps == []
+            
+            await bucket.acquire()
+            await bucket.acquire()
+        
+        # Each token beyond the burst takes 1/20 s to refill
+        assert sleeps == [pytest.approx(0.05), pytest.approx(0.05)]
+        assert now == pytest.approx(100.1)
+
+    def test_clients_only_rate_limit_when_configured(self):
+        """Test that a limiter is created only when requests_per_minute is set."""
+        with patch('openai.AsyncOpenAI'):
+            assert WhisperClient(WhisperConfig(), api_key="test_key")._rate_limiter is None
+            limited = WhisperClient(WhisperConfig(requests_per_minute=120), api_key="test_key")
+        assert limited._rate_limiter.rate == 2.0
+
 
 class TestWhisperClient:
     """Test the main Whisper client."""
@@ -354,6 +548,26 @@ class TestWhisperClient:
         assert result.batch_id == 1
         mock_openai_client.audio.transcriptions.create.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_coalesced_audio_uses_the_batch_sample_rate(self, whisper_client):
+        """Test that gaps and offsets follow the batches' own sample rate."""
+        batches = [AudioBatch(np.full(8000, 1000, dtype=np.int16), datetime.now(),
+                              sequence_id=seq, sample_rate=8000) for seq in range(2)]
+        whisper_client.transcribe_batch = AsyncMock(return_value=TranscriptionResult(
+            "one two",
+            [TranscriptionSegment("one", 0.1, 0.9, 0.9), TranscriptionSegment("two", 1.6, 2.4, 0.9)],
+            "en", 2.5, 0
+        ))
+        
+        results = await whisper_client.transcribe_coalesced(batches, gap_sec=0.5)
+        
+        combined = whisper_client.transcribe_batch.call_args.args[0]
+        # 1s + 0.5s gap + 1s at 8 kHz
+        assert len(combined.audio_data) == 20000
+        assert combined.duration == pytest.approx(2.5)
+        assert [r.text for r in results] == ["one", "two"]
+        assert results[1].segments[0].start_time == pytest.approx(0.1)
+
     @pytest.mark.asyncio
     async def test_transcribe_batch_with_retry(self, whisper_client, mock_openai_client):
         """Test batch transcription with retry on failure."""
@@ -433,26 +647,6 @@ class TestWhisperClient:
             assert result.text == f"Batch {i}"
             assert result.batch_id == i
 
-    def test_audio_preprocessing(self, whisper_client):
-        """Test audio preprocessing before transcription."""
-        # Test with various audio conditions
-        
-        # Normal audio
-        normal_audio = np.random.randint(-16000, 16000, 16000, dtype=np.int16)
-        processed_normal = whisper_client._preprocess_audio(normal_audio)
-        assert processed_normal.dtype == np.int16
-        assert len(processed_normal) == len(normal_audio)
-        
-        # Silent audio
-        silent_audio = np.zeros(16000, dtype=np.int16)
-        processed_silent = whisper_client._preprocess_audio(silent_audio)
-        assert len(processed_silent) == len(silent_audio)
-        
-        # Clipped audio
-        clipped_audio = np.full(16000, 32767, dtype=np.int16)
-        processed_clipped = whisper_client._preprocess_audio(clipped_audio)
-        assert np.max(processed_clipped) <= 32767
-
 
 class TestWhisperIntegrationScenarios:
     """Test realistic integration scenarios."""
@@ -568,4 +762,200 @@ class TestWhisperIntegrationScenarios:
         
         # Successful results should have correct content
         assert successful_results[0].text == "Second batch success"
-        assert successful_results[1].text == "Fourth batch success"
\ No newline at end of file
+        assert successful_results[1].text == "Fourth batch success"
+
+
+class TestTranscriptionManager:
+    """Test the Whisper transcription pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_batches_run_in_parallel_and_deliver_in_order(self):
+        """Test that batches overlap up to the limit but results keep queue order."""
+        from src.livetranscripts.whisper_integration import TranscriptionManager
+        
+        whisper_client = Mock()
+        whisper_client.config = WhisperConfig(max_concurrent_batches=2, max_coalesce=1, silence_peak_threshold=0)
+        in_flight = 0
+        peak = 0
+        
+        async def transcribe(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # The first batch is slowest, so results finish out of order
+            await asyncio.sleep(batch.delay)
+            in_flight -= 1
+            if batch.text is None:
+                raise RuntimeError("API error")
+            return TranscriptionResult(batch.text, [], "en", 1.0, 0)
+        
+        whisper_client.transcribe_batch = transcribe
+        manager = TranscriptionManager(whisper_client)
+        delivered = []
+        manager.add_result_callback(AsyncMock(side_effect=lambda r: delivered.append(r.text)))
+        
+        await manager.start_processing()
+        for text, delay in [("one", 0.05), (None, 0.01), ("three", 0.01)]:
+            await manager.transcribe_batch(Mock(text=text, delay=delay))
+        await asyncio.sleep(0.2)
+        await manager.stop_processing()
+        
+        assert delivered == ["one", "three"]
+        assert peak == 2
+        transcript = manager.get_full_transcript()
+        assert transcript == "one three"
+        assert manager.get_full_transcript() is transcript
+
+    def test_dispatch_hooks_must_be_implemented(self):
+        """Test that a manager missing a dispatch hook fails when it is created."""
+        from src.livetranscripts.whisper_integration import OrderedDispatchMixin
+        
+        class Incomplete(OrderedDispatchMixin):
+            async def _transcribe_work(self, work):
+                return work
+        
+        with pytest.raises(TypeError, match="_deliver_result"):
+            Incomplete()
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded_but_statistics_cover_every_result(self):
+        """Test that old results age out while running totals keep counting them."""
+        from src.livetranscripts.whisper_integration import TranscriptionManager
+        
+        whisper_client = Mock()
+        whisper_client.config = WhisperConfig(history_max=2)
+        whisper_client.get_statistics.return_value = {}
+        manager = TranscriptionManager(whisper_client)
+        
+        for ticket, text in enumerate(["one", "two", "three"]):
+            manager._completed[ticket] = [TranscriptionResult(
+                text=text,
+                segments=[TranscriptionSegment(text, 0.0, 1.0, 0.5)],
+                language="en",
+                duration=1.0,
+                batch_id=ticket
+            )]
+        await manager._deliver_in_order()
+        
+        assert [r.text for r in manager.get_recent_transcriptions(10)] == ["two", "three"]
+        assert manager.get_full_transcript() == "one two three"
+        stats = manager.get_statistics()
+        assert stats['transcription_count'] == 3
+        assert stats['total_transcribed_duration'] == 3.0
+        assert stats['average_confidence'] == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_silent_results_are_not_recorded_or_announced(self):
+        """Test that empty results from skipped batches stay out of the transcript."""
+        from src.livetranscripts.whisper_integration import TranscriptionManager
+        
+        whisper_client = Mock()
+        whisper_client.config = WhisperConfig()
+        manager = TranscriptionManager(whisper_client)
+        callback = AsyncMock()
+        manager.add_result_callback(callback)
+        
+        manager._completed[0] = [
+            TranscriptionResult("one", [], "en", 1.0, 0),
+            TranscriptionResult("", [], "en", 1.0, 1),
+            TranscriptionResult("three", [], "en", 1.0, 2),
+        ]
+        await manager._deliver_in_order()
+        
+        assert [call.args[0].text for call in callback.await_args_list] == ["one", "three"]
+        assert manager.get_full_transcript() == "one three"
+
+    @pytest.mark.asyncio
+    async def test_queued_batches_are_coalesced_into_one_request(self):
+        """Test that waiting batches share a request and get their own segments back."""
+        from src.livetranscripts.whisper_integration import TranscriptionManager, WhisperClient
+        
+        with patch('openai.AsyncOpenAI') as mock_openai:
+            mock_client = Mock()
+            mock_response = Mock()
+            mock_response.text = "first second third"
+            mock_response.language = "en"
+            # Batches of 2s, 2s and 30s start at 0.0, 2.5 and 5.0 with 0.5s gaps
+            mock_response.segments = [
+                Mock(text="first", start=0.2, end=1.8, confidence=0.9),
+                Mock(text="second", start=2.6, end=4.4, confidence=0.8),
+            ]
+            mock_client.audio.transcriptions.create = AsyncMock(return_value=mock_response)
+            mock_openai.return_value = mock_client
+            whisper_client = WhisperClient(WhisperConfig(), api_key="test_key")
+        
+        manager = TranscriptionManager(whisper_client)
+        for seq, seconds in enumerate([2, 2, 30]):
+            audio = np.full(seconds * 16000, 1000, dtype=np.int16)
+            await manager._processing_queue.put(AudioBatch(audio, datetime.now(), sequence_id=seq))
+        
+        manager.is_processing = True
+        batches = manager._coalesce_queued(await manager._processing_queue.get())
+        # The 30s batch would push the request past coalesce_max_sec
+        assert [b.sequence_id for b in batches] == [0, 1]
+        assert manager._held_batch.sequence_id == 2
+        
+        await manager._inflight_sem.acquire()
+        await manager._handle_batch(0, batches)
+        
+        mock_client.audio.transcriptions.create.assert_called_once()
+        results = manager.get_recent_transcriptions()
+        assert [(r.batch_id, r.text) for r in results] == [(0, "first"), (1, "second")]
+        assert results[1].segments[0].start_time == pytest.approx(0.1)
+        assert results[1].segments[0].end_time == pytest.approx(1.9)
+        assert whisper_client.get_statistics()['total_requests'] == 1
+
+    @pytest.mark.asyncio
+    async def test_stopping_with_a_backlog_delivers_the_queued_batches(self):
+        """Test that coalescing stops at the stop sentinel instead of tripping over it."""
+        from src.livetranscripts.whisper_integration import TranscriptionManager
+        
+        whisper_client = Mock()
+        whisper_client.config = WhisperConfig(max_concurrent_batches=1)
+        whisper_client.transcribe_coalesced = AsyncMock(side_effect=lambda batches, gap: [
+            TranscriptionResult(f"batch {b.sequence_id}", [], "en", 1.0, b.sequence_id)
+            for b in batches
+        ])
+        manager = TranscriptionManager(whisper_client)
+        speech = np.full(16000, 1000, dtype=np.int16)
+        
+        manager.is_processing = True
+        for seq in range(3):
+            await manager.transcribe_batch(AudioBatch(speech, datetime.now(), sequence_id=seq))
+        await manager.stop_processing()
+        # The loop starts only now, so it finds the sentinel behind the backlog
+        await asyncio.wait_for(manager._process_queue(), timeout=1.0)
+        await asyncio.gather(*manager._batch_tasks)
+        
+        assert [r.text for r in manager.get_recent_transcriptions()] == [
+            "batch 0", "batch 1", "batch 2"
+        ]
+        assert not manager._inflight_sem.locked()
+
+    @pytest.mark.asyncio
+    async def test_silent_batches_skip_the_api(self):
+        """Test that silent batches get empty results and stay out of the request."""
+        from src.livetranscripts.whisper_integration import TranscriptionManager
+        
+        whisper_client = Mock()
+        whisper_client.config = WhisperConfig(language="en")
+        whisper_client.transcribe_coalesced = AsyncMock(return_value=[
+            TranscriptionResult("first", [], "en", 1.0, 0),
+            TranscriptionResult("third", [], "en", 1.0, 2),
+        ])
+        manager = TranscriptionManager(whisper_client)
+        speech = np.full(16000, 1000, dtype=np.int16)
+        quiet = np.full(16000, 50, dtype=np.int16)
+        batches = [AudioBatch(audio, datetime.now(), sequence_id=seq)
+                   for seq, audio in enumerate([speech, quiet, speech])]
+        
+        results = await manager._transcribe_work(batches)
+        
+        sent = whisper_client.transcribe_coalesced.call_args.args[0]
+        assert [b.sequence_id for b in sent] == [0, 2]
+        assert [(r.batch_id, r.text) for r in results] == [(0, "first"), (1, ""), (2, "third")]
+        assert results[1].language == "en"
+        
+        whisper_client.transcribe_batch = AsyncMock()
+        assert (await manager._transcribe_work([batches[1]]))[0].text == ""
+        whisper_client.transcribe_batch.assert_not_called()